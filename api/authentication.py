@@ -0,0 +1,20 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+
+
+class ClaimsTokenUser(TokenUser):
+    """
+    Lightweight user built from access token claims by JWTStatelessUserAuthentication,
+    used on read-only endpoints so authorization needs no User or auth_group queries.
+    Tokens issued before the claims existed leave group_names as None, and
+    get_group_names falls back to the database.
+    """
+
+    @cached_property
+    def group_names(self):
+        groups = self.token.get("groups")
+        return frozenset(groups) if groups is not None else None
+
+    @cached_property
+    def church_id(self):
+        return self.token.get("church_id")
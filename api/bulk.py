@@ -0,0 +1,30 @@
+"""Batching and raw INSERT helpers shared by bulk writers (seeding, recommendations)."""
+
+from itertools import islice
+from django.db import connection
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def insert_rows(model, constants, columns, rows):
+    """
+    INSERT rows with a single executemany, skipping the ORM's per-value preparation
+    (the dominant cost of bulk_create at millions of rows). `rows` yields tuples of
+    database-ready values for `columns`; `constants` supplies the same value for
+    every row. Field names are mapped to their database columns.
+    """
+    opts = model._meta
+    names = list(columns) + list(constants)
+    qn = connection.ops.quote_name
+    sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+        qn(opts.db_table),
+        ", ".join(qn(opts.get_field(name).column) for name in names),
+        ", ".join(["%s"] * len(names)),
+    )
+    constant_values = tuple(constants.values())
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [tuple(row) + constant_values for row in rows])
@@ -0,0 +1,128 @@
+"""
+The API's cache layer, on top of the Django cache configured by CACHE_URL.
+
+- Tags: every key embeds the current version of each tag it depends on, so
+  invalidate("church:12") makes every entry tagged church:12 unreachable at once,
+  across all workers sharing the backend, without tracking which keys exist.
+- Stampede protection: on a miss only the caller holding a short cache.add() lock
+  computes the value; concurrent callers wait briefly for it instead of all hitting
+  the database.
+- Hit/miss counters per process, reported by /api/admin/profiling/.
+
+Tag versions live in the same backend, so with the default local-memory cache both
+entries and invalidations are per process. Page caching (API_PAGE_CACHE) is
+therefore off unless CACHE_URL selects a shared backend.
+"""
+
+import hashlib
+import threading
+import time
+from django.core.cache import caches
+
+MISSING = object()
+
+
+class ApiCache:
+    def __init__(self, alias="default", prefix="api", lock_timeout=10, poll=0.05):
+        self.alias = alias
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.poll = poll
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "waits": 0}
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def _tag_key(self, tag):
+        return f"{self.prefix}:tag:{tag}"
+
+    def tag_versions(self, tags):
+        keys = [self._tag_key(tag) for tag in tags]
+        versions = self.backend.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                self.backend.add(key, 1, timeout=None)
+                versions[key] = self.backend.get(key, 1)
+        return [versions[key] for key in keys]
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            key = self._tag_key(tag)
+            try:
+                self.backend.incr(key)
+            except ValueError:
+                self.backend.add(key, 2, timeout=None)
+
+    def key(self, name, parts=(), tags=()):
+        """Build a key for `name` that changes whenever any of `tags` is invalidated."""
+        versions = self.tag_versions(tags)
+        material = "|".join(
+            [*(f"{t}={v}" for t, v in zip(tags, versions)), *map(str, parts)]
+        )
+        return f"{self.prefix}:{name}:{hashlib.sha1(material.encode()).hexdigest()}"
+
+    def get(self, key, default=None):
+        value = self.backend.get(key, MISSING)
+        if value is MISSING:
+            self._count("misses")
+            return default
+        self._count("hits")
+        return value
+
+    def set(self, key, value, timeout):
+        self.backend.set(key, value, timeout)
+
+    def fill(self, key, compute, timeout):
+        """
+        Compute and store the value for a key just found missing. Only the lock holder
+        computes; others poll until the value appears or the lock is released.
+        """
+        lock_key = f"{key}:lock"
+        if self.backend.add(lock_key, 1, timeout=self.lock_timeout):
+            try:
+                value = compute()
+                self.backend.set(key, value, timeout)
+                return value
+            finally:
+                self.backend.delete(lock_key)
+
+        self._count("waits")
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll)
+            value = self.backend.get(key, MISSING)
+            if value is not MISSING:
+                return value
+            if self.backend.get(lock_key) is None:
+                break
+        return compute()
+
+    def get_or_set(self, key, compute, timeout):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            value = self.fill(key, compute, timeout)
+        return value
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = (
+            round(counters["hits"] / lookups, 3) if lookups else None
+        )
+        counters["backend"] = self.backend.__class__.__name__
+        return counters
+
+    def reset_stats(self):
+        with self.lock:
+            for name in self.counters:
+                self.counters[name] = 0
+
+
+api_cache = ApiCache()
@@ -0,0 +1,85 @@
+"""
+Conditional GET and server-side page caching for read-heavy list endpoints.
+
+With API_PAGE_CACHE on, pages are stored through api.cache under tags ("jobs",
+"candidates", "church:<id>") that model signals invalidate (see api/signals.py),
+keyed by the request's path and query string. With it off, the validators are
+computed from the database on every request and nothing is cached, so a write made
+through another worker is never hidden behind a stale page or ETag.
+"""
+
+import hashlib
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from .cache import api_cache
+
+
+def cached_list_response(view, request, queryset, tags, related=()):
+    """
+    Paginate and serialize `queryset` through `view`, honouring If-None-Match and
+    If-Modified-Since.
+
+    A cached page answers a repeat poll with no queries at all. Otherwise one
+    aggregate query (row count and latest updated_at of the filtered rows and of the
+    `related` rows the serializer nests) yields the validators, so an unchanged page
+    can still return 304 before any rows are read.
+    """
+    use_cache = settings.API_PAGE_CACHE
+    if use_cache:
+        key = api_cache.key("page", parts=[request.get_full_path()], tags=tags)
+        cached = api_cache.get(key)
+    else:
+        key, cached = request.get_full_path(), None
+    if cached is not None:
+        etag, last_modified = cached["etag"], cached["last_modified"]
+    else:
+        stamp = queryset.order_by().aggregate(
+            count=Count("id"),
+            last_modified=Max("updated_at"),
+            **{f"{name}_modified": Max(f"{name}__updated_at") for name in related},
+        )
+        count = stamp.pop("count")
+        latest = max(filter(None, stamp.values()), default=None)
+        # Last-Modified has one-second resolution; the ETag keeps the full timestamp
+        last_modified = int(latest.timestamp()) if latest else None
+        material = f"{key}|{count}|{latest}"
+        etag = quote_etag(hashlib.sha1(material.encode()).hexdigest())
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return _with_validators(not_modified, etag, last_modified)
+
+    if cached is None:
+
+        def build():
+            page = view.paginate_queryset(queryset)
+            if page is not None:
+                data = view.get_paginated_response(
+                    view.get_serializer(page, many=True).data
+                ).data
+            else:
+                data = view.get_serializer(queryset, many=True).data
+            return {"etag": etag, "last_modified": last_modified, "data": data}
+
+        if use_cache:
+            cached = api_cache.fill(key, build, settings.API_RESPONSE_CACHE_TIMEOUT)
+        else:
+            cached = build()
+
+    return _with_validators(
+        Response(cached["data"]), cached["etag"], cached["last_modified"]
+    )
+
+
+def _with_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Clients may keep the response but must revalidate it on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
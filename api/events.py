@@ -0,0 +1,149 @@
+"""
+Push notifications for the /api/events/ server-sent events stream.
+
+Writes publish small events (ids only; clients fetch details from the REST
+endpoints) to channels once their transaction commits:
+
+- "user:<id>": activity the user can list themselves, i.e. their own interests and
+  the matches on interests they expressed
+- "church:<id>": interests and matches on the church's jobs, as listed by
+  my-church-interests
+
+The broker is chosen by the EVENTS_BROKER setting. A broker implements:
+
+- subscribe(channels) -> Subscription, called from the event loop serving the stream
+- unsubscribe(subscription)
+- publish(channels, event), callable from any thread; a subscriber receives each
+  event once however many of its channels it was published to
+
+InProcessBroker only reaches streams served by the same process, so it suits a single
+ASGI process; with several processes, plug in a broker backed by a shared service.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from .models import Job
+
+
+class Subscription:
+    def __init__(self, channels, queue_size):
+        self.channels = frozenset(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        # Set when events were dropped because the client could not keep up
+        self.overflowed = False
+
+    def deliver(self, event):
+        """Queue an event; runs on the subscription's event loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Return the next event, or None if none arrives within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels, self.queue_size)
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscribers = self.subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.subscriptions[channel]
+
+    def publish(self, channels, event):
+        with self.lock:
+            targets = set()
+            for channel in channels:
+                targets.update(self.subscriptions.get(channel, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The stream's event loop has shut down
+                self.unsubscribe(subscription)
+        return len(targets)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.EVENTS_BROKER)()
+        return _broker
+
+
+def publish_on_commit(channels, event):
+    transaction.on_commit(partial(get_broker().publish, channels, event))
+
+
+def _job_church_id(instance):
+    # The job is usually loaded already by the view that saved the interest
+    if type(instance).job_listing.is_cached(instance):
+        return instance.job_listing.church_id
+    return (
+        Job.objects.filter(pk=instance.job_listing_id)
+        .values_list("church_id", flat=True)
+        .first()
+    )
+
+
+def interest_created(interest):
+    channels = [f"church:{_job_church_id(interest)}"]
+    if interest.expressed_by_user_id:
+        channels.append(f"user:{interest.expressed_by_user_id}")
+    publish_on_commit(
+        channels,
+        {
+            "type": "interest",
+            "id": interest.pk,
+            "job_listing": interest.job_listing_id,
+            "profile": interest.profile_id,
+            "expressed_by": interest.expressed_by,
+        },
+    )
+
+
+def match_created(match):
+    channels = [f"church:{_job_church_id(match)}"]
+    for interest in (match.church_interest, match.candidate_interest):
+        if interest.expressed_by_user_id:
+            channels.append(f"user:{interest.expressed_by_user_id}")
+    publish_on_commit(
+        channels,
+        {
+            "type": "match",
+            "id": match.pk,
+            "job_listing": match.job_listing_id,
+            "profile": match.profile_id,
+            "church_interest": match.church_interest_id,
+        },
+    )
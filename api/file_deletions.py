@@ -0,0 +1,106 @@
+"""
+Worker side of the FileDeletion outbox: deletes queued files from storage in batches
+and reschedules failures with exponential backoff.
+
+On S3 a batch is one DeleteObjects call (up to 1000 keys); other storages delete
+file by file. Deleting a file that is already gone counts as success, so a batch
+that is retried after a crash is harmless.
+"""
+
+from datetime import timedelta
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import FileDeletion, file_storage
+
+S3_BATCH_LIMIT = 1000
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 6 * 60 * 60
+
+
+def get_storage():
+    return file_storage or default_storage
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    )
+
+
+def delete_names(storage, names):
+    """Delete stored files; returns {name: error message} for those that failed."""
+    bucket = getattr(storage, "bucket", None)
+    if bucket is not None:
+        return _delete_s3_objects(storage, names)
+    errors = {}
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as exc:
+            errors[name] = str(exc) or type(exc).__name__
+    return errors
+
+
+def _delete_s3_objects(storage, names):
+    errors = {}
+    client = storage.bucket.meta.client
+    for start in range(0, len(names), S3_BATCH_LIMIT):
+        chunk = names[start : start + S3_BATCH_LIMIT]
+        try:
+            response = client.delete_objects(
+                Bucket=storage.bucket_name,
+                Delete={"Objects": [{"Key": name} for name in chunk], "Quiet": True},
+            )
+        except Exception as exc:
+            errors.update(dict.fromkeys(chunk, str(exc) or type(exc).__name__))
+            continue
+        # Quiet mode only reports failures
+        for error in response.get("Errors", []):
+            errors[error["Key"]] = f"{error.get('Code')}: {error.get('Message')}"
+    return errors
+
+
+def process_batch(batch_size=S3_BATCH_LIMIT, storage=None):
+    """
+    Delete up to `batch_size` due files. Returns (deleted, failed). Rows are claimed
+    with SELECT ... FOR UPDATE SKIP LOCKED where supported, so several workers can
+    run at once without deleting the same file twice.
+    """
+    storage = storage or get_storage()
+    now = timezone.now()
+    with transaction.atomic():
+        due = FileDeletion.objects.filter(next_attempt_at__lte=now).order_by(
+            "next_attempt_at", "id"
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        rows = list(due[:batch_size])
+        if not rows:
+            return 0, 0
+
+        errors = delete_names(storage, sorted({row.name for row in rows}))
+        done = [row.pk for row in rows if row.name not in errors]
+        failed = [row for row in rows if row.name in errors]
+        FileDeletion.objects.filter(pk__in=done).delete()
+        for row in failed:
+            row.attempts += 1
+            row.last_error = errors[row.name][:1000]
+            row.next_attempt_at = now + retry_delay(row.attempts)
+        FileDeletion.objects.bulk_update(
+            failed, ["attempts", "last_error", "next_attempt_at"]
+        )
+    return len(done), len(failed)
+
+
+def process(batch_size=S3_BATCH_LIMIT, max_batches=None, storage=None):
+    """Process due deletions until none are left. Returns (deleted, failed)."""
+    deleted = failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        batch_deleted, batch_failed = process_batch(batch_size, storage)
+        if not batch_deleted and not batch_failed:
+            break
+        deleted += batch_deleted
+        failed += batch_failed
+        batches += 1
+    return deleted, failed
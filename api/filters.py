@@ -0,0 +1,111 @@
+import django_filters
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Left, Lower, Trim
+from .geo import zipcodes_within
+from .models import Job, Profile
+
+
+class NearZipcodeFilterSet(django_filters.FilterSet):
+    """
+    Adds near=<zip>&radius=<miles> to a FilterSet. Subclasses set `zipcode_field`
+    to the lookup holding the row's ZIP code. An unknown ZIP matches nothing.
+    Stored ZIP codes are free text, so rows match on their first five characters
+    after trimming: ZIP+4 and padded values count as their five-digit ZIP.
+    """
+
+    zipcode_field = "zipcode"
+    default_radius = 25
+    max_radius = 500
+
+    near = django_filters.CharFilter(method="filter_near")
+    radius = django_filters.NumberFilter(method="filter_radius", min_value=0)
+
+    def filter_radius(self, queryset, name, value):
+        # Applied together with `near`
+        return queryset
+
+    def filter_near(self, queryset, name, value):
+        radius = self.form.cleaned_data.get("radius")
+        if radius is None:
+            radius = self.default_radius
+        radius = min(float(radius), self.max_radius)
+        within = zipcodes_within(value, radius)
+        if within is None:
+            return queryset.none()
+        return queryset.alias(near_zipcode=Left(Trim(self.zipcode_field), 5)).filter(
+            near_zipcode__in=list(within)
+        )
+
+
+class JobFilter(NearZipcodeFilterSet):
+    zipcode_field = "church__zipcode"
+
+    class Meta:
+        model = Job
+        fields = ["status", "church", "ministry_type", "employment_type"]
+
+
+class ApprovedCandidateFilter(NearZipcodeFilterSet):
+    """
+    Filters for church users browsing approved candidates. Each lookup is written so
+    it can use one of the Profile indexes (see Profile.Meta and migration 0012).
+    """
+
+    state = django_filters.CharFilter(method="filter_state")
+    city = django_filters.CharFilter(method="filter_city")
+    zipcode = django_filters.CharFilter(method="filter_zipcode")
+    placement_preferences = django_filters.CharFilter(method="filter_placement")
+    search = django_filters.CharFilter(method="filter_search")
+
+    class Meta:
+        model = Profile
+        fields = [
+            "state",
+            "city",
+            "zipcode",
+            "placement_preferences",
+            "search",
+            "near",
+            "radius",
+        ]
+
+    def filter_state(self, queryset, name, value):
+        return queryset.filter(state=value.strip().upper())
+
+    def filter_city(self, queryset, name, value):
+        # Compare against Lower("city") so the expression index applies;
+        # city__iexact compiles to UPPER()/LIKE, which it would not.
+        return queryset.alias(city_lower=Lower("city")).filter(
+            city_lower=value.strip().lower()
+        )
+
+    def filter_zipcode(self, queryset, name, value):
+        # A prefix is a half-open range, which a plain B-tree index serves on
+        # every backend (startswith becomes a LIKE that often cannot).
+        prefix = value.strip()
+        if not prefix:
+            return queryset
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return queryset.filter(zipcode__gte=prefix, zipcode__lt=upper)
+
+    def filter_placement(self, queryset, name, value):
+        if connection.vendor == "postgresql":
+            # Served by the jsonb_path_ops GIN index on placement_preferences
+            return queryset.filter(placement_preferences__contains=[value])
+        # JSON containment is not available on SQLite; test array membership directly
+        return queryset.filter(
+            RawSQL(
+                'EXISTS (SELECT 1 FROM json_each("api_profile"."placement_preferences") '
+                "WHERE json_each.value = %s)",
+                [value],
+                output_field=BooleanField(),
+            )
+        )
+
+    def filter_search(self, queryset, name, value):
+        # On PostgreSQL a trigram index on UPPER(name) serves icontains
+        for word in value.split():
+            queryset = queryset.filter(user__name__icontains=word)
+        return queryset
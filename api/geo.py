@@ -0,0 +1,59 @@
+"""
+Radius search over ZIP centroids without PostGIS: a bounding box on the indexed
+latitude/longitude columns narrows the candidates, then haversine gives exact distances.
+"""
+
+import math
+from .models import ZipCentroid
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, miles):
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing a circle of `miles`."""
+    lat_delta = math.degrees(miles / EARTH_RADIUS_MILES)
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6:
+        lon_delta = 180.0
+    else:
+        lon_delta = min(180.0, lat_delta / cos_lat)
+    return (
+        latitude - lat_delta,
+        latitude + lat_delta,
+        longitude - lon_delta,
+        longitude + lon_delta,
+    )
+
+
+def zipcodes_within(zipcode, miles):
+    """
+    Map each known ZIP code within `miles` of `zipcode` to its distance in miles.
+    Returns None when `zipcode` is not in the centroid table.
+    """
+    origin = (
+        ZipCentroid.objects.filter(zipcode=zipcode.strip()[:5])
+        .values_list("latitude", "longitude")
+        .first()
+    )
+    if origin is None:
+        return None
+    latitude, longitude = origin
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, miles)
+    candidates = ZipCentroid.objects.filter(
+        latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon)
+    ).values_list("zipcode", "latitude", "longitude")
+    within = {}
+    for other, lat, lon in candidates:
+        distance = haversine_miles(latitude, longitude, lat, lon)
+        if distance <= miles:
+            within[other] = distance
+    return within
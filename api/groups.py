@@ -0,0 +1,36 @@
+"""Cached auth group ids, so hot write paths can insert memberships directly."""
+
+import hashlib
+from django.contrib.auth.models import Group
+from django.db import transaction
+from .cache import api_cache
+
+# Group saves and deletes drop the entry in this process and in any worker sharing
+# the cache backend; the timeout bounds how long other workers keep a stale id
+GROUP_ID_CACHE_TIMEOUT = 300
+
+
+def group_id_key(name):
+    # Hashed: group names contain spaces, which memcached-safe keys may not
+    digest = hashlib.sha1(name.encode()).hexdigest()
+    return f"{api_cache.prefix}:group-id:{digest}"
+
+
+def get_group_id(name):
+    """
+    Return the id of the named group, creating the group if it does not exist. The
+    id is only cached once the lookup's transaction has committed.
+    """
+    key = group_id_key(name)
+    group_id = api_cache.backend.get(key)
+    if group_id is None:
+        group, _ = Group.objects.get_or_create(name=name)
+        group_id = group.pk
+        transaction.on_commit(
+            lambda: api_cache.backend.set(key, group_id, GROUP_ID_CACHE_TIMEOUT)
+        )
+    return group_id
+
+
+def forget_group_id(name):
+    api_cache.backend.delete(group_id_key(name))
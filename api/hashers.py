@@ -0,0 +1,62 @@
+"""
+Password hashers whose cost parameters come from settings, selected by
+PASSWORD_HASHER_PROFILE (see settings.py).
+
+Each keeps its base class's algorithm name, so hashes stored under Django's own
+hasher of the same algorithm still verify. When a stored hash used different
+parameters or another profile's algorithm, Django re-hashes the password with the
+preferred hasher on the next successful check_password (every login).
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+def _setting(name, default):
+    value = getattr(settings, name, None)
+    return default if value is None else value
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _setting("PASSWORD_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return _setting("PASSWORD_SCRYPT_WORK_FACTOR", ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return _setting("PASSWORD_SCRYPT_BLOCK_SIZE", ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return _setting("PASSWORD_SCRYPT_PARALLELISM", ScryptPasswordHasher.parallelism)
+
+    # scrypt needs about 128 * n * r bytes and OpenSSL refuses more than 32 MiB by
+    # default. This is a ceiling, not an allocation: it must also admit stored hashes
+    # made with larger parameters than the current ones.
+    maxmem = 1024**3
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Requires the optional argon2-cffi package."""
+
+    @property
+    def time_cost(self):
+        return _setting("PASSWORD_ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _setting("PASSWORD_ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _setting("PASSWORD_ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
@@ -0,0 +1,168 @@
+import json
+import statistics
+import subprocess
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient
+from api.models import Job, Match, MutualInterest, Profile
+from api.profiling import percentile
+from api.seeding import seed_dataset
+
+# (name, url, role used to authenticate)
+ENDPOINTS = [
+    ("approved-jobs", "/api/jobs/approved-jobs/", "candidate_user"),
+    (
+        "approved-jobs-cursor",
+        "/api/jobs/approved-jobs/?pagination=cursor",
+        "candidate_user",
+    ),
+    ("my-jobs", "/api/jobs/my-jobs/", "church_user"),
+    ("approved-candidates", "/api/approved-candidates/", "church_user"),
+    ("profiles", "/api/profiles/", "admin"),
+    ("profiles-deep-page", "/api/profiles/?page={last_page}", "admin"),
+    ("mutual-interests", "/api/mutual-interests/", "church_user"),
+    (
+        "my-church-interests",
+        "/api/mutual-interests/my-church-interests/",
+        "church_user",
+    ),
+    ("mutual-matches", "/api/mutual-interests/matches/", "church_user"),
+    ("admin-matches", "/api/mutual-interests/admin-matches/", "admin"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with a fixed-seed dataset and report "
+        "p50/p95 latency, query counts and rows/sec for each API endpoint as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--churches", type=int, default=50)
+        parser.add_argument("--jobs-per-church", type=int, default=10)
+        parser.add_argument("--profiles", type=int, default=2000)
+        parser.add_argument("--interests", type=int, default=10000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Timed requests per endpoint, after one warm-up request",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report to this file instead of stdout"
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = self.run_benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def run_benchmark(self, options):
+        start = time.perf_counter()
+        users = seed_dataset(
+            churches=options["churches"],
+            jobs_per_church=options["jobs_per_church"],
+            profiles=options["profiles"],
+            interests=options["interests"],
+            seed=options["seed"],
+        )
+        seed_seconds = time.perf_counter() - start
+
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        last_page = max(1, -(-Profile.objects.count() // page_size))
+        client = APIClient()
+        results = {}
+        for name, url, role in ENDPOINTS:
+            client.force_authenticate(user=users[role])
+            results[name] = self.time_endpoint(
+                client, url.format(last_page=last_page), options["iterations"]
+            )
+
+        return {
+            "commit": git_commit(),
+            "database": connection.vendor,
+            "config": {
+                key: options[key]
+                for key in (
+                    "churches",
+                    "jobs_per_church",
+                    "profiles",
+                    "interests",
+                    "seed",
+                    "iterations",
+                )
+            },
+            "dataset": {
+                "jobs": Job.objects.count(),
+                "profiles": Profile.objects.count(),
+                "interests": MutualInterest.objects.count(),
+                "matches": Match.objects.count(),
+                "seed_seconds": round(seed_seconds, 2),
+            },
+            "endpoints": results,
+        }
+
+    def time_endpoint(self, client, url, iterations):
+        client.get(url)  # warm-up
+        durations = []
+        query_counts = []
+        rows = 0
+        status_code = None
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                durations.append(time.perf_counter() - start)
+            query_counts.append(len(captured.captured_queries))
+            status_code = response.status_code
+            data = getattr(response, "data", None)
+            if isinstance(data, dict) and "results" in data:
+                rows = len(data["results"])
+            elif isinstance(data, list):
+                rows = len(data)
+
+        durations_ms = sorted(d * 1000 for d in durations)
+        mean_seconds = statistics.fmean(durations)
+        return {
+            "url": url,
+            "status": status_code,
+            "p50_ms": round(percentile(durations_ms, 50), 2),
+            "p95_ms": round(percentile(durations_ms, 95), 2),
+            "mean_ms": round(mean_seconds * 1000, 2),
+            "queries": max(query_counts),
+            "rows": rows,
+            "rows_per_sec": round(rows / mean_seconds, 1) if mean_seconds else None,
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
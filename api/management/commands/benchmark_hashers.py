@@ -0,0 +1,103 @@
+import json
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+PARAMETERS = {
+    "pbkdf2": ("iterations",),
+    "scrypt": ("work_factor", "block_size", "parallelism"),
+    "argon2": ("time_cost", "memory_cost", "parallelism"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time each password hasher profile at its configured parameters on one core "
+        "and report hashes/sec as JSON, to size workers for peak login traffic"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=sorted(settings.PASSWORD_HASHER_PROFILES),
+            help="Profile to time (repeatable; default: all)",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=2.0,
+            help="Minimum time spent hashing per profile (at least 3 hashes)",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100.0,
+            help="Per-hash latency to suggest a PBKDF2 iteration count for",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report to this file instead of stdout"
+        )
+
+    def handle(self, *args, **options):
+        if options["seconds"] <= 0 or options["target_ms"] <= 0:
+            raise CommandError("--seconds and --target-ms must be positive.")
+        cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 0
+        cores = cores or os.cpu_count() or 1
+        profiles = options["profile"] or list(settings.PASSWORD_HASHER_PROFILES)
+
+        results = {}
+        for name in profiles:
+            hasher = import_string(settings.PASSWORD_HASHER_PROFILES[name])()
+            try:
+                results[name] = self.time_hasher(hasher, options["seconds"], cores)
+            except ValueError as exc:
+                # e.g. argon2-cffi is not installed
+                results[name] = {"error": str(exc)}
+            results[name]["parameters"] = {
+                param: getattr(hasher, param) for param in PARAMETERS.get(name, ())
+            }
+
+        report = {
+            "active_profile": settings.PASSWORD_HASHER_PROFILE,
+            "cores": cores,
+            "profiles": results,
+        }
+        pbkdf2 = results.get("pbkdf2", {})
+        if "ms_per_hash" in pbkdf2:
+            # PBKDF2 time is linear in the iteration count
+            iterations = pbkdf2["parameters"]["iterations"]
+            suggested = iterations * options["target_ms"] / pbkdf2["ms_per_hash"]
+            report["pbkdf2_iterations_for_target"] = {
+                "target_ms": options["target_ms"],
+                "iterations": int(round(suggested, -4)) or 10000,
+            }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def time_hasher(self, hasher, seconds, cores):
+        salt = hasher.salt()
+        hasher.encode("warm-up password", salt)
+        count = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while count < 3 or elapsed < seconds:
+            # Logins verify, which costs one encode
+            hasher.encode(f"benchmark password {count}", salt)
+            count += 1
+            elapsed = time.perf_counter() - start
+        per_core = count / elapsed
+        return {
+            "algorithm": hasher.algorithm,
+            "ms_per_hash": round(elapsed / count * 1000, 2),
+            "hashes_per_sec_per_core": round(per_core, 1),
+            "hashes_per_sec_all_cores": round(per_core * cores, 1),
+        }
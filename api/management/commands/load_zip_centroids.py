@@ -0,0 +1,74 @@
+import csv
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from api.models import ZipCentroid
+
+SAMPLE_FILE = Path(__file__).resolve().parents[2] / "data" / "zip_centroids_sample.csv"
+
+# Census ZCTA Gazetteer columns, then the bundled sample's
+ZIP_COLUMNS = ("GEOID", "zipcode")
+LATITUDE_COLUMNS = ("INTPTLAT", "latitude")
+LONGITUDE_COLUMNS = ("INTPTLONG", "longitude")
+
+
+def pick(row, columns):
+    for column in columns:
+        if column in row:
+            return row[column]
+    raise KeyError(columns[0])
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace the ZIP centroid table from a Census ZCTA Gazetteer file "
+        "(tab-delimited) or a zipcode,latitude,longitude CSV"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=str(SAMPLE_FILE),
+            help="Centroid file to load (default: the bundled sample)",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def read_rows(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            lines = (line for line in f if not line.startswith("#"))
+            header = next(lines, "")
+            delimiter = "\t" if "\t" in header else ","
+            fieldnames = [name.strip() for name in header.split(delimiter)]
+            for row in csv.DictReader(
+                lines, fieldnames=fieldnames, delimiter=delimiter
+            ):
+                try:
+                    yield ZipCentroid(
+                        zipcode=pick(row, ZIP_COLUMNS).strip().zfill(5),
+                        latitude=float(pick(row, LATITUDE_COLUMNS)),
+                        longitude=float(pick(row, LONGITUDE_COLUMNS)),
+                    )
+                except KeyError as exc:
+                    raise CommandError(f"{path}: missing column {exc}") from None
+
+    def handle(self, *args, **options):
+        path = options["file"]
+        if not Path(path).is_file():
+            raise CommandError(f"File not found: {path}")
+        batch_size = options["batch_size"]
+
+        loaded = 0
+        with transaction.atomic():
+            ZipCentroid.objects.all().delete()
+            batch = []
+            for centroid in self.read_rows(path):
+                batch.append(centroid)
+                if len(batch) >= batch_size:
+                    ZipCentroid.objects.bulk_create(batch)
+                    loaded += len(batch)
+                    batch = []
+            if batch:
+                ZipCentroid.objects.bulk_create(batch)
+                loaded += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Loaded {loaded} ZIP centroids."))
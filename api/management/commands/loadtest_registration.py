@@ -0,0 +1,208 @@
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import InviteCode, Profile
+from api.profiling import percentile
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent candidate registrations against one invite code in a "
+        "throwaway test database, report throughput and latency as JSON and check "
+        "that the code's used_count matches the registrations that succeeded"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--signups", type=int, default=500)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Registrations in flight at once (one thread and DB connection each)",
+        )
+        parser.add_argument(
+            "--max-uses",
+            type=int,
+            help="Limit the invite code, e.g. below --signups to exercise rejections",
+        )
+        parser.add_argument(
+            "--fast-hashing",
+            action="store_true",
+            help="Hash passwords with MD5 to measure the database path alone",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report to this file instead of stdout"
+        )
+
+    def handle(self, *args, **options):
+        if options["signups"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--signups and --concurrency must be positive.")
+
+        setup_test_environment()
+        test_settings = connection.settings_dict["TEST"]
+        old_test_name = test_settings.get("NAME")
+        tmpdir = None
+        if connection.vendor == "sqlite":
+            # The default in-memory test database uses shared-cache table locks that
+            # fail concurrent writers immediately instead of waiting for them, and
+            # writers queue behind one another for longer than the default 5s timeout
+            tmpdir = tempfile.TemporaryDirectory()
+            test_settings["NAME"] = os.path.join(tmpdir.name, "loadtest.sqlite3")
+            connection.settings_dict["OPTIONS"].setdefault("timeout", 60)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            hashers = (
+                ["django.contrib.auth.hashers.MD5PasswordHasher"]
+                if options["fast_hashing"]
+                else None
+            )
+            if hashers:
+                with override_settings(PASSWORD_HASHERS=hashers):
+                    report = self.run_load_test(options)
+            else:
+                report = self.run_load_test(options)
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings["NAME"] = old_test_name
+            if tmpdir:
+                tmpdir.cleanup()
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
+        if not report["consistent"]:
+            raise CommandError("used_count does not match successful registrations.")
+
+    def run_load_test(self, options):
+        creator = User.objects.create_user(
+            username="loadtest-admin@example.com",
+            email="loadtest-admin@example.com",
+            password="unused",
+            name="Load Test",
+            status="active",
+        )
+        invite = InviteCode.objects.create(
+            code="LOADTEST",
+            event="Registration load test",
+            status="active",
+            created_by=creator,
+            expires_at=timezone.now() + timedelta(days=1),
+            max_uses=options["max_uses"],
+        )
+
+        signups = options["signups"]
+        workers = min(options["concurrency"], signups)
+        numbers = iter(range(signups))
+        numbers_lock = threading.Lock()
+        results = []
+        # Workers wait at the gate until all are ready, so the first wave of
+        # registrations hits the endpoint together
+        gate = threading.Barrier(workers + 1)
+
+        def register(client, n):
+            start = time.perf_counter()
+            try:
+                response = client.post(
+                    "/api/candidates/register/",
+                    {
+                        "invite_code": invite.code,
+                        "email": f"loadtest{n}@example.com",
+                        "password": f"load-test-password-{n}",
+                        "first_name": "Load",
+                        "last_name": f"Tester{n}",
+                    },
+                    format="json",
+                )
+                outcome = response.status_code
+            except Exception as exc:
+                outcome = type(exc).__name__
+            return outcome, time.perf_counter() - start
+
+        def worker():
+            # Server errors come back as 500 responses: the test client's exception
+            # capture is process-wide and would blame other threads' requests
+            client = APIClient(raise_request_exception=False)
+            gate.wait()
+            try:
+                while True:
+                    with numbers_lock:
+                        n = next(numbers, None)
+                    if n is None:
+                        return
+                    results.append(register(client, n))
+            finally:
+                # Each thread has its own connection; close it before the test
+                # database is destroyed
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        gate.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        outcomes = {}
+        for outcome, _ in results:
+            outcomes[str(outcome)] = outcomes.get(str(outcome), 0) + 1
+        succeeded = outcomes.get("201", 0)
+        durations_ms = sorted(duration * 1000 for _, duration in results)
+
+        invite.refresh_from_db()
+        registered_users = User.objects.filter(invite_code=invite).count()
+        profiles = Profile.objects.filter(invite_code=invite).count()
+        candidates = User.objects.filter(
+            invite_code=invite, groups__name="Candidate"
+        ).count()
+        expected = signups
+        if options["max_uses"] is not None:
+            expected = min(signups, options["max_uses"])
+
+        return {
+            "database": connection.vendor,
+            "config": {
+                key: options[key]
+                for key in ("signups", "concurrency", "max_uses", "fast_hashing")
+            },
+            "seconds": round(elapsed, 3),
+            "registrations_per_sec": round(succeeded / elapsed, 1),
+            "p50_ms": round(percentile(durations_ms, 50), 2),
+            "p95_ms": round(percentile(durations_ms, 95), 2),
+            "mean_ms": round(statistics.fmean(durations_ms), 2),
+            "outcomes": outcomes,
+            "used_count": invite.used_count,
+            "expected_used_count": expected,
+            "users": registered_users,
+            "profiles": profiles,
+            "candidate_memberships": candidates,
+            "consistent": invite.used_count
+            == succeeded
+            == registered_users
+            == profiles
+            == candidates
+            == expected,
+        }
@@ -0,0 +1,46 @@
+import time
+from django.core.management.base import BaseCommand
+from api import file_deletions
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete files queued in the FileDeletion outbox from storage, in batches "
+        "with retries (run on a schedule, or continuously with --loop)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=file_deletions.S3_BATCH_LIMIT,
+            help="Files deleted per batch; S3 accepts up to 1000 per request",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches (default: until nothing is due)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling for due deletions every --interval seconds",
+        )
+        parser.add_argument("--interval", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            deleted, failed = file_deletions.process(
+                batch_size=options["batch_size"], max_batches=options["max_batches"]
+            )
+            if deleted or failed or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Deleted {deleted} files, {failed} failed and rescheduled "
+                        f"in {time.perf_counter() - start:.1f}s."
+                    )
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from api.models import Match, MutualInterest
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Match table from scratch using existing mutual interests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of matches to insert per query (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        candidate_side = MutualInterest.objects.filter(
+            job_listing=OuterRef("job_listing"),
+            profile=OuterRef("profile"),
+            expressed_by="candidate",
+        ).values("id")[:1]
+        pairs = (
+            MutualInterest.objects.filter(expressed_by="church")
+            .annotate(candidate_interest_id=Subquery(candidate_side))
+            .filter(candidate_interest_id__isnull=False)
+            .order_by()
+            .values_list("id", "candidate_interest_id", "job_listing_id", "profile_id")
+        )
+
+        created = 0
+        with transaction.atomic():
+            deleted, _ = Match.objects.all().delete()
+            batch = []
+            for church_id, candidate_id, job_id, profile_id in pairs.iterator(
+                chunk_size=batch_size
+            ):
+                batch.append(
+                    Match(
+                        job_listing_id=job_id,
+                        profile_id=profile_id,
+                        church_interest_id=church_id,
+                        candidate_interest_id=candidate_id,
+                    )
+                )
+                if len(batch) >= batch_size:
+                    Match.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                Match.objects.bulk_create(batch)
+                created += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt matches: removed {deleted}, created {created}."
+            )
+        )
@@ -0,0 +1,63 @@
+import time
+from django.core.management.base import BaseCommand
+from api import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every candidate/job recommendation score from scratch, or with "
+        "--pending refresh only the jobs and profiles queued by saves (run on a "
+        "schedule, or continuously with --loop)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help=(
+                "Profiles scored and rows inserted per batch (default: 2000), or with "
+                "--pending queued refreshes per transaction (default: 100)"
+            ),
+        )
+        parser.add_argument(
+            "--pending",
+            action="store_true",
+            help="Refresh only the jobs and profiles queued in RecommendationRefresh",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="With --pending, keep polling the queue every --interval seconds",
+        )
+        parser.add_argument("--interval", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        if options["pending"]:
+            return self.process_pending(options)
+        start = time.perf_counter()
+        removed, created = recommendations.rebuild(
+            batch_size=options["batch_size"] or 2000
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt recommendations: removed {removed}, created {created} "
+                f"in {time.perf_counter() - start:.1f}s."
+            )
+        )
+
+    def process_pending(self, options):
+        while True:
+            start = time.perf_counter()
+            refreshed = recommendations.process_pending(
+                batch_size=options["batch_size"] or 100
+            )
+            if refreshed or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Refreshed recommendations for {refreshed} queued jobs and "
+                        f"profiles in {time.perf_counter() - start:.1f}s."
+                    )
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
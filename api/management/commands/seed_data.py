@@ -0,0 +1,60 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from api.seeding import SEED_EMAIL_DOMAIN, Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate deterministic churches, jobs, candidate profiles and mutual "
+        "interests for reproducing production-scale performance locally"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--churches", type=int, default=1000)
+        parser.add_argument("--jobs-per-church", type=int, default=5)
+        parser.add_argument("--profiles", type=int, default=100000)
+        parser.add_argument("--interests", type=int, default=300000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--password",
+            default="seedpassword",
+            help="Password shared by every seeded user (hashed once)",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if User.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").exists():
+            raise CommandError(
+                f"Seed data (@{SEED_EMAIL_DOMAIN} users) already exists in this database."
+            )
+
+        self.last_reported = {}
+        start = time.perf_counter()
+        Seeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            password=options["password"],
+            progress=self.report_progress,
+        ).seed(
+            churches=options["churches"],
+            jobs_per_church=options["jobs_per_church"],
+            profiles=options["profiles"],
+            interests=options["interests"],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {connection.vendor} database in {elapsed:.1f}s. "
+                f"Log in as admin@{SEED_EMAIL_DOMAIN} with the seed password."
+            )
+        )
+
+    def report_progress(self, label, done, total):
+        # Report every 5% per stage
+        percent = 100 * done // total if total else 100
+        if percent // 5 > self.last_reported.get(label, -1) or done == total:
+            self.last_reported[label] = percent // 5
+            self.stdout.write(f"  {label}: {done:,}/{total:,} ({percent}%)")
@@ -0,0 +1,54 @@
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from . import profiling
+
+
+class QueryProfilingMiddleware:
+    """
+    Record query count, SQL time, serializer time and response size per resolved URL
+    name. Results are sent in a Server-Timing header and kept in a rolling in-memory
+    aggregate served by the admin profiling endpoint.
+
+    Enabled with the API_PROFILING setting; when it is off Django drops the
+    middleware at startup, so it costs nothing per request.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "API_PROFILING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        profiling.install_serializer_timer()
+
+    def __call__(self, request):
+        sample = profiling.Sample()
+        token = profiling.current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample.record_query))
+                response = self.get_response(request)
+        finally:
+            profiling.current_sample.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+        sql_ms = sample.sql_seconds * 1000
+        serializer_ms = sample.serializer_seconds * 1000
+
+        size = None if response.streaming else len(response.content)
+        match = request.resolver_match
+        url_name = match.view_name if match else "unresolved"
+        profiling.store.add(
+            url_name, total_ms, sql_ms, sample.query_count, serializer_ms, size
+        )
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={sql_ms:.2f};desc="{sample.query_count} queries"',
+                f"serialize;dur={serializer_ms:.2f}",
+                f"total;dur={total_ms:.2f}",
+            ]
+        )
+        return response
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.3 on 2026-10-16 22:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_matches(apps, schema_editor):
+    MutualInterest = apps.get_model("api", "MutualInterest")
+    Match = apps.get_model("api", "Match")
+    candidate_side = {
+        (job_id, profile_id): interest_id
+        for interest_id, job_id, profile_id in MutualInterest.objects.filter(
+            expressed_by="candidate"
+        ).values_list("id", "job_listing_id", "profile_id")
+    }
+    matches = []
+    for interest_id, job_id, profile_id in MutualInterest.objects.filter(
+        expressed_by="church"
+    ).values_list("id", "job_listing_id", "profile_id"):
+        candidate_interest_id = candidate_side.get((job_id, profile_id))
+        if candidate_interest_id:
+            matches.append(
+                Match(
+                    job_listing_id=job_id,
+                    profile_id=profile_id,
+                    church_interest_id=interest_id,
+                    candidate_interest_id=candidate_interest_id,
+                )
+            )
+    Match.objects.bulk_create(matches, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0008_profile_profile_image"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="invitecode",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("active", "Active"),
+                    ("inactive", "Inactive"),
+                    ("expired", "Expired"),
+                ],
+                default="active",
+                max_length=10,
+            ),
+        ),
+        migrations.CreateModel(
+            name="Match",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "candidate_interest",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="candidate_match",
+                        to="api.mutualinterest",
+                    ),
+                ),
+                (
+                    "church_interest",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="church_match",
+                        to="api.mutualinterest",
+                    ),
+                ),
+                (
+                    "job_listing",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matches",
+                        to="api.job",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matches",
+                        to="api.profile",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Matches",
+                "ordering": ["-created_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job_listing", "profile"), name="unique_match_per_pair"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_matches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.3 on 2026-10-16 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0009_match"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="job_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("status", "approved")),
+                fields=["-created_at", "-id"],
+                name="job_approved_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["church", "-created_at", "-id"], name="job_church_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mutualinterest",
+            index=models.Index(
+                fields=["expressed_by_user", "-created_at"],
+                name="interest_user_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mutualinterest",
+            index=models.Index(
+                condition=models.Q(("expressed_by", "church")),
+                fields=["expressed_by_user", "-created_at"],
+                name="interest_church_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="profile_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                condition=models.Q(("status", "approved")),
+                fields=["-created_at", "-id"],
+                name="profile_approved_created_idx",
+            ),
+        ),
+    ]
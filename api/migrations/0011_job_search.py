@@ -0,0 +1,65 @@
+# Generated by Django 5.2.3 on 2026-10-16 22:51
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Title weighs most, then the description, then the church blurb.
+POSTGRES_VECTOR = """
+    setweight(to_tsvector('english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}job_description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}about_church, '')), 'C')
+"""
+
+POSTGRES_INSTALL = [
+    f"""
+    CREATE OR REPLACE FUNCTION api_job_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {POSTGRES_VECTOR.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER api_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON api_job
+    FOR EACH ROW EXECUTE FUNCTION api_job_search_vector_update()
+    """,
+    f"UPDATE api_job SET search_vector = {POSTGRES_VECTOR.format(row='')}",
+    "CREATE INDEX api_job_search_vector_gin ON api_job USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS api_job_search_vector_gin",
+    "DROP TRIGGER IF EXISTS api_job_search_vector_trigger ON api_job",
+    "DROP FUNCTION IF EXISTS api_job_search_vector_update()",
+]
+
+
+def install_search(apps, schema_editor):
+    # SQLite's FTS5 table is managed by api.search on post_migrate.
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in POSTGRES_INSTALL:
+            schema_editor.execute(sql)
+
+
+def uninstall_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in POSTGRES_UNINSTALL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0010_list_endpoint_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:06
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+POSTGRES_INSTALL = [
+    # placement_preferences @> '["..."]' for approved profiles
+    """
+    CREATE INDEX profile_approved_placement_gin ON api_profile
+    USING GIN (placement_preferences jsonb_path_ops) WHERE status = 'approved'
+    """,
+    # name__icontains compiles to UPPER(name::text) LIKE UPPER(%s)
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX user_name_upper_trgm ON api_user
+    USING GIN (UPPER(name::text) gin_trgm_ops)
+    """,
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS user_name_upper_trgm",
+    "DROP INDEX IF EXISTS profile_approved_placement_gin",
+]
+
+
+def install_postgres_indexes(apps, schema_editor):
+    # SQLite has no JSON containment index; api.filters falls back to json_each.
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in POSTGRES_INSTALL:
+            schema_editor.execute(sql)
+
+
+def uninstall_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in POSTGRES_UNINSTALL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0011_job_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                condition=models.Q(("status", "approved")),
+                fields=["state", "-created_at", "-id"],
+                name="profile_approved_state_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                django.db.models.functions.text.Lower("city"),
+                models.OrderBy(models.F("created_at"), descending=True),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("status", "approved")),
+                name="profile_approved_city_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                fields=["status", "zipcode"], name="profile_status_zipcode_idx"
+            ),
+        ),
+        migrations.RunPython(install_postgres_indexes, uninstall_postgres_indexes),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0012_candidate_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ZipCentroid",
+            fields=[
+                (
+                    "zipcode",
+                    models.CharField(max_length=5, primary_key=True, serialize=False),
+                ),
+                ("latitude", models.FloatField()),
+                ("longitude", models.FloatField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["latitude", "longitude"], name="zip_lat_lon_idx"
+                    )
+                ],
+            },
+        ),
+    ]
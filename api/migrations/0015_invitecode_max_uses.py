@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0014_recommendation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invitecode",
+            name="max_uses",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Q
 from django.db.models.functions import Lower
+from django.utils import timezone
 from storages.backends.s3boto3 import S3Boto3Storage
 
 
@@ -131,6 +134,8 @@ class InviteCode(models.Model):
     code = models.CharField(max_length=50, unique=True)
     event = models.CharField(max_length=255)
     used_count = models.PositiveIntegerField(default=0)
+    # Registrations allowed with this code; null means unlimited
+    max_uses = models.PositiveIntegerField(null=True, blank=True)
     status = models.CharField(
         max_length=10, choices=INVITE_CODE_STATUS_CHOICES, default="active"
     )
@@ -147,6 +152,30 @@ class InviteCode(models.Model):
     def __str__(self):
         return f"{self.code} ({self.event})"
 
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    @property
+    def is_used_up(self):
+        return self.max_uses is not None and self.used_count >= self.max_uses
+
+    def claim(self):
+        """
+        Count one use of this code in a single conditional UPDATE, so concurrent
+        registrations can neither lose increments nor exceed max_uses. Returns False
+        if the code is no longer active, has expired or has no uses left.
+        """
+        under_limit = Q(max_uses__isnull=True) | Q(used_count__lt=F("max_uses"))
+        return bool(
+            InviteCode.objects.filter(
+                under_limit,
+                pk=self.pk,
+                status="active",
+                expires_at__gt=timezone.now(),
+            ).update(used_count=F("used_count") + 1, updated_at=timezone.now())
+        )
+
 
 class Profile(models.Model):
     user = models.OneToOneField(
@@ -184,6 +213,33 @@ class Profile(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="profile_status_created_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=Q(status="approved"),
+                name="profile_approved_created_idx",
+            ),
+            models.Index(
+                fields=["state", "-created_at", "-id"],
+                condition=Q(status="approved"),
+                name="profile_approved_state_idx",
+            ),
+            models.Index(
+                Lower("city"),
+                F("created_at").desc(),
+                F("id").desc(),
+                condition=Q(status="approved"),
+                name="profile_approved_city_idx",
+            ),
+            models.Index(
+                fields=["status", "zipcode"],
+                name="profile_status_zipcode_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} ({self.user.email})"
@@ -194,27 +250,25 @@ class Profile(models.Model):
         Reset a user's profile to initial draft state.
         Deletes existing profile and its resume file, then creates a fresh one with only basic fields.
         """
-        # Delete existing profile and its resume file and profile image files if they exist
-        existing = cls.objects.filter(user=user)
-        if existing.exists():
-            old_profile = existing.first()
-            if old_profile.resume:
-                old_profile.resume.delete(save=False)
-            if old_profile.profile_image:
-                old_profile.profile_image.delete(save=False)
-            old_profile.delete()
-
-        # Create fresh profile with initial state
-        return cls.objects.create(
-            user=user,
-            invite_code=invite_code,
-            status="draft",
-            street_address="",  # Required field, set to empty string
-            city="",  # Required field, set to empty string
-            state="",  # Required field, set to empty string
-            zipcode="",  # Required field, set to empty string
-            resume=None,  # Remove file reference from DB
-        )
+        with transaction.atomic():
+            # Delete the existing profile; its resume and profile image files are
+            # queued in the same transaction and removed later by a worker
+            old_profile = cls.objects.filter(user=user).first()
+            if old_profile is not None:
+                FileDeletion.enqueue(old_profile.resume, old_profile.profile_image)
+                old_profile.delete()
+
+            # Create fresh profile with initial state
+            return cls.objects.create(
+                user=user,
+                invite_code=invite_code,
+                status="draft",
+                street_address="",  # Required field, set to empty string
+                city="",  # Required field, set to empty string
+                state="",  # Required field, set to empty string
+                zipcode="",  # Required field, set to empty string
+                resume=None,  # Remove file reference from DB
+            )
 
 
 class Job(models.Model):
@@ -234,14 +288,49 @@ class Job(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL; unused elsewhere (see api/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="job_status_created_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=Q(status="approved"),
+                name="job_approved_created_idx",
+            ),
+            models.Index(
+                fields=["church", "-created_at", "-id"],
+                name="job_church_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.church.name}"
 
 
+class MutualInterestQuerySet(models.QuerySet):
+    def with_is_mutual(self):
+        """
+        Annotate each interest with whether the other side of its job/profile pair
+        has also expressed interest, so serializing a page costs no extra queries.
+        """
+        counterpart = MutualInterest.objects.filter(
+            job_listing=OuterRef("job_listing"), profile=OuterRef("profile")
+        ).exclude(expressed_by=OuterRef("expressed_by"))
+        return self.annotate(annotated_is_mutual=Exists(counterpart))
+
+    def for_serializer(self):
+        """Load exactly the relations and annotations MutualInterestSerializer reads."""
+        return self.select_related(
+            "job_listing__church", "profile__user"
+        ).with_is_mutual()
+
+
 class MutualInterest(models.Model):
     EXPRESSOR_CHOICES = [
         ("candidate", "Candidate"),
@@ -264,6 +353,8 @@ class MutualInterest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MutualInterestQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -271,11 +362,36 @@ class MutualInterest(models.Model):
                 name="unique_interest_per_side",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["expressed_by_user", "-created_at"],
+                name="interest_user_created_idx",
+            ),
+            models.Index(
+                fields=["expressed_by_user", "-created_at"],
+                condition=Q(expressed_by="church"),
+                name="interest_church_user_idx",
+            ),
+        ]
         ordering = ["-created_at"]
 
     def __str__(self):
         return f"{self.expressed_by.title()} → Profile {self.profile_id} / Job {self.job_listing_id}"
 
+    def save(self, *args, **kwargs):
+        """
+        Save and sync the Match (post_save) in one transaction that first locks the
+        job row. Both sides of a pair expressing interest at once are then serialized:
+        the later sync runs after the earlier interest has committed and sees it.
+        """
+        with transaction.atomic():
+            list(
+                Job.objects.select_for_update()
+                .filter(pk=self.job_listing_id)
+                .values_list("pk", flat=True)
+            )
+            super().save(*args, **kwargs)
+
     @property
     def is_mutual(self):
         """Return True if both candidate and church have expressed interest for the same job/profile pair."""
@@ -285,3 +401,189 @@ class MutualInterest(models.Model):
             ).count()
             == 2
         )
+
+
+class ZipCentroid(models.Model):
+    """Latitude/longitude of a ZIP code's centroid, loaded by `load_zip_centroids`."""
+
+    zipcode = models.CharField(max_length=5, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="zip_lat_lon_idx"),
+        ]
+
+    def __str__(self):
+        return self.zipcode
+
+
+class Match(models.Model):
+    """
+    A job/profile pair where both the church and the candidate have expressed interest.
+    Rows are maintained on write from MutualInterest signals (see api/signals.py) and
+    can be rebuilt with the rebuild_matches management command.
+    """
+
+    job_listing = models.ForeignKey(
+        "Job", on_delete=models.CASCADE, related_name="matches"
+    )
+    profile = models.ForeignKey(
+        "Profile", on_delete=models.CASCADE, related_name="matches"
+    )
+    church_interest = models.OneToOneField(
+        "MutualInterest", on_delete=models.CASCADE, related_name="church_match"
+    )
+    candidate_interest = models.OneToOneField(
+        "MutualInterest", on_delete=models.CASCADE, related_name="candidate_match"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job_listing", "profile"],
+                name="unique_match_per_pair",
+            )
+        ]
+        ordering = ["-created_at"]
+        verbose_name_plural = "Matches"
+
+    def __str__(self):
+        return f"Match → Profile {self.profile_id} / Job {self.job_listing_id}"
+
+    @classmethod
+    def sync_for_interest(cls, interest):
+        """
+        Create or remove the Match for a saved interest's job/profile pair.
+        Withdrawn interests need no handling here: deleting either side cascades to the Match.
+        """
+        with transaction.atomic():
+            existing = cls.objects.filter(
+                Q(church_interest=interest) | Q(candidate_interest=interest)
+            )
+            counterpart = (
+                MutualInterest.objects.filter(
+                    job_listing_id=interest.job_listing_id,
+                    profile_id=interest.profile_id,
+                )
+                .exclude(expressed_by=interest.expressed_by)
+                .first()
+            )
+            if counterpart is None:
+                existing.delete()
+                return None
+
+            if interest.expressed_by == "church":
+                church_interest, candidate_interest = interest, counterpart
+            else:
+                church_interest, candidate_interest = counterpart, interest
+
+            # Drop a Match left over from before the interest changed pair or side
+            existing.exclude(
+                church_interest=church_interest, candidate_interest=candidate_interest
+            ).delete()
+            match, _ = cls.objects.get_or_create(
+                church_interest=church_interest,
+                candidate_interest=candidate_interest,
+                defaults={
+                    "job_listing_id": interest.job_listing_id,
+                    "profile_id": interest.profile_id,
+                },
+            )
+            return match
+
+
+class Recommendation(models.Model):
+    """
+    Precomputed relevance of an approved job to an approved candidate profile; each
+    profile keeps only its best-scoring jobs (see api/recommendations.py). Saves queue
+    the job/profile in RecommendationRefresh (see api/signals.py), and the whole table
+    can be rebuilt with the rebuild_recommendations management command.
+    """
+
+    job = models.ForeignKey(
+        "Job", on_delete=models.CASCADE, related_name="recommendations"
+    )
+    profile = models.ForeignKey(
+        "Profile", on_delete=models.CASCADE, related_name="recommendations"
+    )
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "profile"],
+                name="unique_recommendation_per_pair",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["job", "-score", "-id"], name="rec_job_score_idx"),
+            models.Index(
+                fields=["profile", "-score", "-id"],
+                name="rec_profile_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Recommendation {self.score:.2f} → Profile {self.profile_id} / Job {self.job_id}"
+
+
+class RecommendationRefresh(models.Model):
+    """
+    Queue of jobs and profiles whose recommendations are stale. A save touching a
+    scoring field adds a row in its own transaction; refreshing one job scores every
+    approved profile, so rows are processed outside the request by
+    `rebuild_recommendations --pending`. Repeated saves may queue the same object
+    more than once; a batch refreshes each object once.
+    """
+
+    JOB = "job"
+    PROFILE = "profile"
+    KIND_CHOICES = [(JOB, "Job"), (PROFILE, "Profile")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Refresh {self.kind} {self.object_id}"
+
+    @classmethod
+    def enqueue(cls, kind, *object_ids):
+        return cls.objects.bulk_create(
+            cls(kind=kind, object_id=object_id) for object_id in object_ids
+        )
+
+
+class FileDeletion(models.Model):
+    """
+    Outbox of stored files to delete. Rows are written in the same transaction that
+    drops the file's last reference, so a rollback keeps the file, and are processed
+    in batches, with retries, by the process_file_deletions command (see
+    api/file_deletions.py) rather than during the request.
+    """
+
+    name = models.CharField(max_length=255)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at", "id"], name="file_deletion_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def enqueue(cls, *files):
+        """Record files (FieldFiles or storage names) for deletion; empty ones are skipped."""
+        names = {getattr(f, "name", f) for f in files} - {None, ""}
+        return cls.objects.bulk_create(cls(name=name) for name in sorted(names))
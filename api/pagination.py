@@ -0,0 +1,69 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (-created_at, -id). Each page is a single indexed range
+    query, with no COUNT(*) or OFFSET, so deep pages cost the same as the first.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class ScoreCursorPagination(CursorPagination):
+    """Keyset pagination over (-score, -id) for precomputed recommendations."""
+
+    ordering = ("-score", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    """
+    Page-number pagination by default, so existing clients keep their count/next/previous
+    responses. Requests with ?pagination=cursor (or carrying a cursor) are paginated by
+    CreatedAtCursorPagination instead.
+    """
+
+    page_number_class = PageNumberPagination
+    cursor_class = CreatedAtCursorPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    def use_cursor(self, request):
+        params = request.query_params
+        return params.get("pagination") == "cursor" or "cursor" in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_class()
+        else:
+            self.paginator = self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number_class().get_schema_operation_parameters(view)
+        parameters += self.cursor_class().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": "pagination",
+                "required": False,
+                "in": "query",
+                "description": "Set to 'cursor' for keyset pagination.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            }
+        )
+        return parameters
@@ -1,16 +1,41 @@
+from django.contrib.auth.models import Group
 from rest_framework.permissions import BasePermission
 
 
+def get_group_names(request):
+    """
+    Return the names of the requesting user's groups. Stateless token users carry
+    them as claims; otherwise they are loaded with a single query the first time they
+    are needed and memoized on the request, so stacked permission checks and views
+    share one lookup.
+    """
+    group_names = getattr(request, "_group_names", None)
+    if group_names is None:
+        user = request.user
+        if user and user.is_authenticated:
+            group_names = getattr(user, "group_names", None)
+            if group_names is None:
+                group_names = frozenset(
+                    Group.objects.filter(user__id=user.pk).values_list(
+                        "name", flat=True
+                    )
+                )
+        else:
+            group_names = frozenset()
+        request._group_names = group_names
+    return group_names
+
+
 class IsInAnyGroup(BasePermission):
     def __init__(self, *group_names):
         self.group_names = group_names
 
     def has_permission(self, request, view):
         user = request.user
-        return (
+        return bool(
             user
             and user.is_authenticated
-            and user.groups.filter(name__in=self.group_names).exists()
+            and not get_group_names(request).isdisjoint(self.group_names)
         )
 
 
@@ -19,9 +44,10 @@ class IsAdminOrChurch(IsInAnyGroup):
         super().__init__("Admin", "Church User")
 
     def has_object_permission(self, request, view, obj):
-        if request.user.groups.filter(name="Admin").exists():
+        group_names = get_group_names(request)
+        if "Admin" in group_names:
             return True
-        if request.user.groups.filter(name="Church User").exists():
+        if "Church User" in group_names:
             user_church_id = getattr(
                 request.user.church_id, "id", None
             )  # ← unwrap Church instance
@@ -0,0 +1,105 @@
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from django.conf import settings
+from rest_framework.serializers import BaseSerializer
+
+
+current_sample = ContextVar("api_profiling_sample", default=None)
+
+
+class Sample:
+    """Timings collected for a single request."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.query_count += 1
+
+
+class ProfileStore:
+    """Thread-safe rolling window of samples per resolved URL name."""
+
+    def __init__(self, window):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+
+    def add(self, url_name, total_ms, sql_ms, query_count, serializer_ms, size):
+        with self.lock:
+            self.samples[url_name].append(
+                (total_ms, sql_ms, query_count, serializer_ms, size)
+            )
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def report(self):
+        with self.lock:
+            snapshot = {name: list(rows) for name, rows in self.samples.items()}
+
+        endpoints = {}
+        for name, rows in sorted(snapshot.items()):
+            totals = sorted(row[0] for row in rows)
+            sizes = [row[4] for row in rows if row[4] is not None]
+            endpoints[name] = {
+                "requests": len(rows),
+                "p50_ms": round(percentile(totals, 50), 2),
+                "p95_ms": round(percentile(totals, 95), 2),
+                "avg_sql_ms": round(statistics.fmean(row[1] for row in rows), 2),
+                "avg_queries": round(statistics.fmean(row[2] for row in rows), 2),
+                "max_queries": max(row[2] for row in rows),
+                "avg_serializer_ms": round(statistics.fmean(row[3] for row in rows), 2),
+                "avg_response_bytes": round(statistics.fmean(sizes)) if sizes else None,
+            }
+        return {"window": self.window, "endpoints": endpoints}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = max(0, round(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+store = ProfileStore(getattr(settings, "API_PROFILING_WINDOW", 500))
+
+_serializer_timer_installed = False
+
+
+def install_serializer_timer():
+    """
+    Time top-level serializer .data evaluation for profiled requests. Nested
+    serializers go through to_representation rather than .data, so they are
+    counted once as part of their parent. Only installed when profiling is enabled.
+    """
+    global _serializer_timer_installed
+    if _serializer_timer_installed:
+        return
+    original = BaseSerializer.data
+
+    def timed_data(self):
+        sample = current_sample.get()
+        if sample is None or sample.serializer_depth:
+            return original.fget(self)
+        sample.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            sample.serializer_seconds += time.perf_counter() - start
+            sample.serializer_depth -= 1
+
+    BaseSerializer.data = property(timed_data)
+    _serializer_timer_installed = True
@@ -0,0 +1,380 @@
+"""
+Candidate/job recommendation scores, stored in the Recommendation table.
+
+A pair's score is a weighted sum of three signals, each in [0, 1]:
+
+- preference: share of the job's ministry_type words found in the candidate's
+  placement_preferences
+- text: share of the candidate's preference words found in the job's title,
+  employment_type and description
+- location: 1 at the same ZIP centroid, falling linearly to 0 at LOCATION_RADIUS_MILES
+  (STATE_SCORE for the same state when either ZIP has no centroid)
+
+Each profile keeps its PER_PROFILE best jobs scoring at least MIN_SCORE. MIN_SCORE is
+above LOCATION_WEIGHT, so a pair sharing no words can never qualify: candidate jobs
+come from a word -> jobs index rather than from scoring every pair.
+
+Saves queue the job or profile in RecommendationRefresh; process_pending (run by
+`rebuild_recommendations --pending`) refreshes them outside the request.
+"""
+
+import heapq
+import logging
+import re
+from collections import defaultdict
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Min, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from .bulk import batched, insert_rows
+from .geo import haversine_miles
+from .models import Job, Profile, Recommendation, RecommendationRefresh, ZipCentroid
+
+PREFERENCE_WEIGHT = 0.45
+TEXT_WEIGHT = 0.2
+LOCATION_WEIGHT = 0.35
+MIN_SCORE = 0.4
+PER_PROFILE = 50
+LOCATION_RADIUS_MILES = 100
+STATE_SCORE = 0.5
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = frozenset(
+    "and are for from our the this that with will you your who ministry ministries "
+    "church".split()
+)
+
+
+def words(text):
+    found = set()
+    for word in re.findall(r"[a-z]+", text.lower()):
+        if len(word) > 2 and word not in STOPWORDS:
+            # Crude plural folding, applied identically on both sides
+            found.add(word[:-1] if len(word) > 3 and word.endswith("s") else word)
+    return found
+
+
+class JobFeatures:
+    def __init__(
+        self, id, ministry_type, employment_type, title, description, zipcode, state
+    ):
+        self.id = id
+        self.role_words = words(ministry_type)
+        self.text_words = words(f"{title} {employment_type} {description}")
+        self.all_words = self.role_words | self.text_words
+        self.zipcode = (zipcode or "").strip()[:5]
+        self.state = state or ""
+
+
+class ProfileFeatures:
+    def __init__(self, id, placement_preferences, zipcode, state):
+        if isinstance(placement_preferences, str):
+            placement_preferences = [placement_preferences]
+        self.id = id
+        self.preference_words = words(" ".join(map(str, placement_preferences or [])))
+        self.zipcode = (zipcode or "").strip()[:5]
+        self.state = state or ""
+
+
+JOB_FIELDS = (
+    "id",
+    "ministry_type",
+    "employment_type",
+    "title",
+    "job_description",
+    "church__zipcode",
+    "church__state",
+)
+PROFILE_FIELDS = ("id", "placement_preferences", "zipcode", "state")
+
+
+def approved_jobs():
+    return Job.objects.filter(status="approved")
+
+
+def approved_profiles():
+    return Profile.objects.filter(status="approved")
+
+
+def job_features(queryset):
+    return [JobFeatures(*row) for row in queryset.values_list(*JOB_FIELDS)]
+
+
+def profile_features(queryset, chunk_size=2000):
+    for row in (
+        queryset.order_by("id")
+        .values_list(*PROFILE_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    ):
+        yield ProfileFeatures(*row)
+
+
+def load_centroids(zipcodes):
+    zipcodes = {z for z in zipcodes if z}
+    return {
+        zipcode: (lat, lon)
+        for zipcode, lat, lon in ZipCentroid.objects.filter(
+            zipcode__in=zipcodes
+        ).values_list("zipcode", "latitude", "longitude")
+    }
+
+
+def location_score(profile, job, centroids):
+    if profile.zipcode and profile.zipcode == job.zipcode:
+        return 1.0
+    a = centroids.get(profile.zipcode)
+    b = centroids.get(job.zipcode)
+    if a and b:
+        distance = haversine_miles(a[0], a[1], b[0], b[1])
+        return max(0.0, 1.0 - distance / LOCATION_RADIUS_MILES)
+    if profile.state and profile.state == job.state:
+        return STATE_SCORE
+    return 0.0
+
+
+def combine(preference, text, location):
+    return (
+        PREFERENCE_WEIGHT * preference + TEXT_WEIGHT * text + LOCATION_WEIGHT * location
+    )
+
+
+def score_pair(profile, job, centroids):
+    preference_words = profile.preference_words
+    preference = (
+        len(preference_words & job.role_words) / len(job.role_words)
+        if job.role_words
+        else 0.0
+    )
+    text = (
+        len(preference_words & job.text_words) / len(preference_words)
+        if preference_words
+        else 0.0
+    )
+    return combine(preference, text, location_score(profile, job, centroids))
+
+
+class JobIndex:
+    """
+    Approved jobs' features with word -> jobs posting lists. A profile is scored
+    against all of its candidate jobs at once by walking the postings of its
+    preference words and counting hits, rather than intersecting sets per pair.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.by_role_word = defaultdict(list)
+        self.by_text_word = defaultdict(list)
+        for job in jobs:
+            for word in job.role_words:
+                self.by_role_word[word].append(job)
+            for word in job.text_words:
+                self.by_text_word[word].append(job)
+
+    def top_jobs(self, profile, centroids):
+        role_hits = defaultdict(int)
+        text_hits = defaultdict(int)
+        for word in profile.preference_words:
+            for job in self.by_role_word.get(word, ()):
+                role_hits[job] += 1
+            for job in self.by_text_word.get(word, ()):
+                text_hits[job] += 1
+
+        preference_count = len(profile.preference_words)
+        locations = {}
+        scored = []
+        for job in role_hits.keys() | text_hits.keys():
+            place = (job.zipcode, job.state)
+            if place not in locations:
+                locations[place] = location_score(profile, job, centroids)
+            score = combine(
+                role_hits.get(job, 0) / len(job.role_words) if job.role_words else 0.0,
+                text_hits.get(job, 0) / preference_count,
+                locations[place],
+            )
+            if score >= MIN_SCORE:
+                scored.append((score, job.id))
+        return heapq.nlargest(PER_PROFILE, scored)
+
+
+def _rows_for(profiles, index, centroids):
+    for profile in profiles:
+        for score, job_id in index.top_jobs(profile, centroids):
+            yield (job_id, profile.id, score)
+
+
+def _store(rows, batch_size):
+    """Insert (job_id, profile_id, score) rows; returns how many were stored."""
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    stored = 0
+    for batch in batched(rows, batch_size):
+        insert_rows(
+            Recommendation,
+            {"computed_at": now},
+            ["job_id", "profile_id", "score"],
+            batch,
+        )
+        stored += len(batch)
+    return stored
+
+
+def rebuild(batch_size=2000):
+    """Recompute every recommendation. Returns (removed, created)."""
+    # Refreshes queued before the rebuild reads anything are covered by it
+    queued = RecommendationRefresh.objects.aggregate(last=Max("id"))["last"]
+    index = JobIndex(job_features(approved_jobs()))
+    job_centroids = load_centroids(job.zipcode for job in index.jobs)
+    created = 0
+    with transaction.atomic():
+        if queued is not None:
+            RecommendationRefresh.objects.filter(id__lte=queued).delete()
+        removed, _ = Recommendation.objects.all().delete()
+        for profiles in batched(
+            profile_features(approved_profiles(), batch_size), batch_size
+        ):
+            centroids = {**job_centroids, **load_centroids(p.zipcode for p in profiles)}
+            created += _store(_rows_for(profiles, index, centroids), batch_size)
+    return removed, created
+
+
+def _any_word_filter(preference_words):
+    # A cheap superset prefilter: jobs mentioning none of the words cannot qualify
+    condition = Q()
+    for word in preference_words:
+        condition |= (
+            Q(ministry_type__icontains=word)
+            | Q(title__icontains=word)
+            | Q(employment_type__icontains=word)
+            | Q(job_description__icontains=word)
+        )
+    return condition
+
+
+def refresh_profile(profile_id, batch_size=2000):
+    """Recompute one profile's recommended jobs (exact)."""
+    with transaction.atomic():
+        Recommendation.objects.filter(profile_id=profile_id).delete()
+        profiles = [
+            ProfileFeatures(*row)
+            for row in approved_profiles()
+            .filter(id=profile_id)
+            .values_list(*PROFILE_FIELDS)
+        ]
+        if not profiles or not profiles[0].preference_words:
+            return 0
+        profile = profiles[0]
+        index = JobIndex(
+            job_features(
+                approved_jobs().filter(_any_word_filter(profile.preference_words))
+            )
+        )
+        centroids = load_centroids(
+            [profile.zipcode, *(job.zipcode for job in index.jobs)]
+        )
+        return _store(_rows_for(profiles, index, centroids), batch_size)
+
+
+def refresh_job(job_id, batch_size=2000):
+    """
+    Recompute one job's place in every profile's recommendations. Profiles gain the
+    job if it now ranks in their top PER_PROFILE; when the job drops out, a profile's
+    next-best job returns on that profile's next refresh or a rebuild.
+    """
+    with transaction.atomic():
+        Recommendation.objects.filter(job_id=job_id).delete()
+        jobs = job_features(approved_jobs().filter(id=job_id))
+        if not jobs:
+            return 0
+        job = jobs[0]
+        created = 0
+        for profiles in batched(
+            profile_features(approved_profiles(), batch_size), batch_size
+        ):
+            candidates = [p for p in profiles if p.preference_words & job.all_words]
+            if not candidates:
+                continue
+            centroids = load_centroids([job.zipcode, *(p.zipcode for p in candidates)])
+            scored = {}
+            for profile in candidates:
+                score = score_pair(profile, job, centroids)
+                if score >= MIN_SCORE:
+                    scored[profile.id] = score
+            if not scored:
+                continue
+            current = {
+                row["profile_id"]: (row["count"], row["lowest"])
+                for row in Recommendation.objects.filter(profile_id__in=scored)
+                .values("profile_id")
+                .annotate(count=Count("id"), lowest=Min("score"))
+            }
+            new = [
+                (job_id, profile_id, score)
+                for profile_id, score in scored.items()
+                if current.get(profile_id, (0, 0))[0] < PER_PROFILE
+                or score > current[profile_id][1]
+            ]
+            created += _store(new, batch_size)
+            _trim([profile_id for _, profile_id, _ in new])
+        return created
+
+
+def _trim(profile_ids):
+    """Drop rows ranked below PER_PROFILE for the given profiles."""
+    if not profile_ids:
+        return
+    overflow = (
+        Recommendation.objects.filter(profile_id__in=profile_ids)
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F("profile_id"),
+                order_by=[F("score").desc(), F("id").desc()],
+            )
+        )
+        .filter(rank__gt=PER_PROFILE)
+        .values_list("id", flat=True)
+    )
+    ids = list(overflow)
+    if ids:
+        Recommendation.objects.filter(id__in=ids).delete()
+
+
+def process_pending_batch(batch_size=100):
+    """
+    Refresh up to `batch_size` queued rows, each job or profile once. Returns the
+    number of objects refreshed. Rows are claimed with SELECT ... FOR UPDATE SKIP
+    LOCKED where supported, so several workers can run at once.
+    """
+    refreshers = {
+        RecommendationRefresh.JOB: refresh_job,
+        RecommendationRefresh.PROFILE: refresh_profile,
+    }
+    with transaction.atomic():
+        queued = RecommendationRefresh.objects.order_by("id")
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        rows = list(queued[:batch_size])
+        pending = {(row.kind, row.object_id) for row in rows}
+        for kind, object_id in sorted(pending):
+            try:
+                with transaction.atomic():
+                    refreshers[kind](object_id)
+            except Exception:
+                # Dropped rather than retried forever; a rebuild repairs the rows
+                logger.exception(
+                    "Refreshing recommendations for %s %s failed", kind, object_id
+                )
+        RecommendationRefresh.objects.filter(id__in=[row.id for row in rows]).delete()
+    return len(pending)
+
+
+def process_pending(batch_size=100, max_batches=None):
+    """Process queued refreshes until none are left. Returns the objects refreshed."""
+    refreshed = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = process_pending_batch(batch_size)
+        if not count:
+            break
+        refreshed += count
+        batches += 1
+    return refreshed
@@ -0,0 +1,136 @@
+"""
+Full-text search over Job title, job_description and about_church.
+
+PostgreSQL: Job.search_vector is a stored tsvector kept current by a BEFORE INSERT OR
+UPDATE trigger and backed by a GIN index (both created in migration 0011).
+
+SQLite: an FTS5 external-content table, api_job_fts, is kept current by triggers on
+api_job. SQLite drops a table's triggers whenever Django rebuilds the table during a
+migration, so the FTS objects are (re)created idempotently on every post_migrate
+rather than once in a migration.
+"""
+
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q, Value
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+SQLITE_FTS_TABLE = "api_job_fts"
+
+SQLITE_FTS_TRIGGERS = {
+    "api_job_fts_insert": """
+        CREATE TRIGGER api_job_fts_insert AFTER INSERT ON api_job BEGIN
+            INSERT INTO api_job_fts(rowid, title, job_description, about_church)
+            VALUES (new.id, new.title, new.job_description, new.about_church);
+        END
+    """,
+    "api_job_fts_delete": """
+        CREATE TRIGGER api_job_fts_delete AFTER DELETE ON api_job BEGIN
+            INSERT INTO api_job_fts(api_job_fts, rowid, title, job_description, about_church)
+            VALUES ('delete', old.id, old.title, old.job_description, old.about_church);
+        END
+    """,
+    "api_job_fts_update": """
+        CREATE TRIGGER api_job_fts_update AFTER UPDATE OF title, job_description, about_church
+        ON api_job BEGIN
+            INSERT INTO api_job_fts(api_job_fts, rowid, title, job_description, about_church)
+            VALUES ('delete', old.id, old.title, old.job_description, old.about_church);
+            INSERT INTO api_job_fts(rowid, title, job_description, about_church)
+            VALUES (new.id, new.title, new.job_description, new.about_church);
+        END
+    """,
+}
+
+# bm25 column weights: title, job_description, about_church
+SQLITE_BM25 = f"bm25({SQLITE_FTS_TABLE}, 10.0, 2.0, 1.0)"
+
+
+def ensure_sqlite_job_fts(conn):
+    """Create the FTS5 table and its triggers if missing, rebuilding the index if so."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s OR name IN (%s, %s, %s)",
+            [SQLITE_FTS_TABLE, *SQLITE_FTS_TRIGGERS],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing == {SQLITE_FTS_TABLE, *SQLITE_FTS_TRIGGERS}:
+            return
+        if SQLITE_FTS_TABLE not in existing:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5("
+                "title, job_description, about_church, "
+                "content='api_job', content_rowid='id', tokenize='porter unicode61')"
+            )
+        for name, sql in SQLITE_FTS_TRIGGERS.items():
+            if name not in existing:
+                cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+@receiver(post_migrate)
+def install_sqlite_job_fts(sender, using="default", **kwargs):
+    from django.db import connections
+
+    conn = connections[using]
+    if sender.name == "api" and conn.vendor == "sqlite":
+        ensure_sqlite_job_fts(conn)
+
+
+def fts5_query(text):
+    """
+    Turn free text into a safe FTS5 expression: every word must match, the last one
+    as a prefix so partially typed words still find results.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_jobs(queryset, text):
+    """Filter a Job queryset to rows matching `text`, annotated with `rank` (higher is better)."""
+    vendor = connection.vendor
+    if vendor == "postgresql":
+        query = SearchQuery(text, search_type="websearch", config="english")
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-created_at", "-id")
+        )
+    if vendor == "sqlite":
+        match = fts5_query(text)
+        if match is None:
+            return queryset.none()
+        # extra() is the only way to join the FTS5 virtual table and rank within it.
+        # The unary + keeps SQLite from probing the FTS table once per api_job row
+        # (e.g. for COUNT(*)); the MATCH always drives and api_job is read by primary key.
+        return queryset.extra(
+            tables=[SQLITE_FTS_TABLE],
+            where=[
+                f'+{SQLITE_FTS_TABLE}.rowid = "api_job"."id"',
+                f"{SQLITE_FTS_TABLE} MATCH %s",
+            ],
+            params=[match],
+            select={"rank": f"-{SQLITE_BM25}"},
+            order_by=["-rank", "-created_at", "-id"],
+        )
+    # Unindexed fallback for other backends
+    words = text.split()
+    condition = Q()
+    for word in words:
+        condition &= (
+            Q(title__icontains=word)
+            | Q(job_description__icontains=word)
+            | Q(about_church__icontains=word)
+        )
+    return (
+        queryset.filter(condition)
+        .annotate(rank=Value(0.0))
+        .order_by("-created_at", "-id")
+    )
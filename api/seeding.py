@@ -0,0 +1,267 @@
+import json
+import random
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from .bulk import batched, insert_rows
+from .models import Church, Job, MutualInterest, Profile, US_STATE_CHOICES
+
+User = get_user_model()
+
+MINISTRY_TYPES = ["Youth", "Worship", "Children", "Adult", "Preaching", "Missions"]
+EMPLOYMENT_TYPES = ["Full Time", "Part Time", "Full Time with Benefits", "Volunteer"]
+STATES = [code for code, _ in US_STATE_CHOICES]
+SEED_EMAIL_DOMAIN = "seed.example.com"
+
+
+class Seeder:
+    """
+    Bulk-create a deterministic dataset: churches each with one church user and
+    jobs_per_church jobs, candidate profiles, an admin user and roughly `interests`
+    mutual interest rows (some pairs expressed by both sides).
+
+    Rows are generated lazily and inserted batch_size at a time, and every seeded
+    user shares one precomputed password hash, so memory and hashing cost stay flat
+    even for millions of profiles. `progress` is called as progress(label, done, total)
+    after each batch.
+    """
+
+    def __init__(self, *, seed=42, batch_size=1000, password=None, progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        # One hash for everyone: create_user would run the full hasher per row
+        self.password_hash = make_password(password) if password else "!"
+        self.progress = progress or (lambda label, done, total: None)
+
+    def seed(self, *, churches, jobs_per_church, profiles, interests):
+        with transaction.atomic():
+            groups = {
+                name: Group.objects.get_or_create(name=name)[0]
+                for name in ("Admin", "Church User", "Candidate")
+            }
+            admin = User.objects.create(
+                email=f"admin@{SEED_EMAIL_DOMAIN}",
+                username=f"admin@{SEED_EMAIL_DOMAIN}",
+                name="Seed Admin",
+                status="active",
+                password=self.password_hash,
+            )
+            admin.groups.add(groups["Admin"])
+
+            church_users, jobs = self.seed_churches(
+                churches, jobs_per_church, groups["Church User"]
+            )
+            candidates = self.seed_profiles(profiles, groups["Candidate"])
+            self.seed_interests(interests, jobs, candidates)
+
+        # insert_rows skips the post_save signal that maintains matches
+        call_command("rebuild_matches", batch_size=self.batch_size, stdout=StringIO())
+
+        return {
+            "admin": admin,
+            "church_user": User.objects.filter(pk=church_users[0]).first()
+            if church_users
+            else None,
+            "candidate_user": User.objects.filter(pk=candidates[0][1]).first()
+            if candidates
+            else None,
+        }
+
+    def seed_churches(self, count, jobs_per_church, group):
+        """Return church user ids and (job_id, church_user_id) tuples."""
+        rng = self.rng
+        Membership = User.groups.through
+        church_user_ids = []
+        jobs = []
+        done = 0
+        for batch in batched(range(count), self.batch_size):
+            church_objs = Church.objects.bulk_create(
+                Church(
+                    name=f"Seed Church {i}",
+                    email=f"church{i}@{SEED_EMAIL_DOMAIN}",
+                    phone="5555555555",
+                    website=f"https://church{i}.{SEED_EMAIL_DOMAIN}",
+                    street_address=f"{i} Main St",
+                    city=f"City {i % 100}",
+                    state=rng.choice(STATES),
+                    zipcode=f"{rng.randint(10000, 99999)}",
+                    status="active",
+                )
+                for i in batch
+            )
+            user_objs = User.objects.bulk_create(
+                User(
+                    email=f"staff{i}@{SEED_EMAIL_DOMAIN}",
+                    username=f"staff{i}@{SEED_EMAIL_DOMAIN}",
+                    name=f"Seed Staff {i}",
+                    status="active",
+                    church_id=church,
+                    password=self.password_hash,
+                )
+                for i, church in zip(batch, church_objs)
+            )
+            Membership.objects.bulk_create(
+                Membership(user_id=user.id, group_id=group.id) for user in user_objs
+            )
+            church_user_ids += [user.id for user in user_objs]
+
+            job_objs = Job.objects.bulk_create(
+                (
+                    Job(
+                        church=church,
+                        title=f"{rng.choice(MINISTRY_TYPES)} Pastor {i}",
+                        ministry_type=rng.choice(MINISTRY_TYPES),
+                        employment_type=rng.choice(EMPLOYMENT_TYPES),
+                        job_description="Lead and grow the ministry. " * 5,
+                        about_church="A welcoming church community. " * 3,
+                        status=rng.choice(
+                            ["approved", "approved", "approved", "pending"]
+                        ),
+                    )
+                    for church in church_objs
+                    for i in range(jobs_per_church)
+                ),
+                batch_size=self.batch_size,
+            )
+            user_by_church = {user.church_id_id: user.id for user in user_objs}
+            jobs += [(job.id, user_by_church[job.church_id]) for job in job_objs]
+            done += len(batch)
+            self.progress("churches", done, count)
+        return church_user_ids, jobs
+
+    def seed_profiles(self, count, group):
+        """Return (profile_id, user_id) tuples."""
+        rng = self.rng
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        candidates = []
+        done = 0
+        for batch in batched(range(count), self.batch_size):
+            usernames = [f"candidate{i}@{SEED_EMAIL_DOMAIN}" for i in batch]
+            insert_rows(
+                User,
+                {
+                    "password": self.password_hash,
+                    "is_superuser": False,
+                    "is_staff": False,
+                    "is_active": True,
+                    "date_joined": now,
+                    "status": "active",
+                    "requires_password_change": False,
+                    "created_at": now,
+                    "updated_at": now,
+                },
+                ["username", "email", "first_name", "last_name", "name"],
+                (
+                    (username, username, f"First{i}", f"Last{i}", f"First{i} Last{i}")
+                    for i, username in zip(batch, usernames)
+                ),
+            )
+            user_ids = dict(
+                User.objects.filter(username__in=usernames).values_list(
+                    "username", "id"
+                )
+            )
+            ordered_user_ids = [user_ids[username] for username in usernames]
+            insert_rows(
+                User.groups.through,
+                {"group_id": group.id},
+                ["user_id"],
+                ((user_id,) for user_id in ordered_user_ids),
+            )
+            insert_rows(
+                Profile,
+                {
+                    "street_address": "",
+                    "phone": "5555555555",
+                    "created_at": now,
+                    "updated_at": now,
+                },
+                [
+                    "user_id",
+                    "city",
+                    "state",
+                    "zipcode",
+                    "status",
+                    "placement_preferences",
+                ],
+                (
+                    (
+                        user_id,
+                        f"City {rng.randint(0, 99)}",
+                        rng.choice(STATES),
+                        f"{rng.randint(10000, 99999)}",
+                        rng.choice(["approved", "approved", "pending", "draft"]),
+                        json.dumps(rng.sample(MINISTRY_TYPES, 2)),
+                    )
+                    for user_id in ordered_user_ids
+                ),
+            )
+            profile_ids = dict(
+                Profile.objects.filter(user_id__in=ordered_user_ids).values_list(
+                    "user_id", "id"
+                )
+            )
+            candidates += [
+                (profile_ids[user_id], user_id) for user_id in ordered_user_ids
+            ]
+            done += len(batch)
+            self.progress("profiles", done, count)
+        return candidates
+
+    def seed_interests(self, count, jobs, candidates):
+        if not jobs or not candidates:
+            return
+        rng = self.rng
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        # Each pair yields 4/3 rows on average (candidate, church or both sides)
+        pairs_per_profile = min(len(jobs), -(-count * 3 // (4 * len(candidates))))
+
+        def rows():
+            emitted = 0
+            for profile_id, user_id in candidates:
+                for job_id, church_user_id in rng.sample(jobs, pairs_per_profile):
+                    sides = rng.choice(
+                        [("candidate",), ("church",), ("candidate", "church")]
+                    )
+                    for side in sides:
+                        yield (
+                            job_id,
+                            profile_id,
+                            side,
+                            church_user_id if side == "church" else user_id,
+                        )
+                        emitted += 1
+                        if emitted >= count:
+                            return
+
+        done = 0
+        for batch in batched(rows(), self.batch_size):
+            insert_rows(
+                MutualInterest,
+                {"created_at": now, "updated_at": now},
+                [
+                    "job_listing_id",
+                    "profile_id",
+                    "expressed_by",
+                    "expressed_by_user_id",
+                ],
+                batch,
+            )
+            done += len(batch)
+            self.progress("interests", done, count)
+
+
+def seed_dataset(
+    *, churches, jobs_per_church, profiles, interests, seed=42, batch_size=1000
+):
+    """Seed a dataset with default options; see Seeder."""
+    return Seeder(seed=seed, batch_size=batch_size).seed(
+        churches=churches,
+        jobs_per_church=jobs_per_church,
+        profiles=profiles,
+        interests=interests,
+    )
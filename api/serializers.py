@@ -1,10 +1,28 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 import logging
 import re
 from rest_framework import serializers
-from .models import Church, US_STATE_CHOICES, InviteCode, MutualInterest, Profile, Job
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from .models import (
+    Church,
+    FileDeletion,
+    US_STATE_CHOICES,
+    InviteCode,
+    MutualInterest,
+    Profile,
+    Job,
+    Recommendation,
+)
+from .groups import forget_group_id, get_group_id
+from .uploads import UPLOAD_RULES
 
 
 User = get_user_model()
@@ -89,7 +107,14 @@ class CandidateRegistrationSerializer(serializers.Serializer):
             raise serializers.ValidationError("Invite code does not exist.")
         if invite.status != "active":
             raise serializers.ValidationError("Invite code is not active.")
-        return value
+        if invite.is_expired:
+            raise serializers.ValidationError("Invite code has expired.")
+        if invite.is_used_up:
+            raise serializers.ValidationError(
+                "Invite code has reached its usage limit."
+            )
+        # Hand the looked-up invite to create() rather than the code string
+        return invite
 
     def validate_email(self, value):
         if User.objects.filter(email=value).exists():
@@ -97,28 +122,44 @@ class CandidateRegistrationSerializer(serializers.Serializer):
         return value
 
     def create(self, validated_data):
-        invite = InviteCode.objects.get(code=validated_data["invite_code"])
-        invite.used_count += 1
-        invite.save()
+        invite = validated_data["invite_code"]
+        email = User.objects.normalize_email(validated_data["email"])
         first_name = validated_data["first_name"].strip().title()
         last_name = validated_data["last_name"].strip().title()
-        full_name = f"{first_name} {last_name}"
-        user = User.objects.create_user(
-            username=validated_data["email"],
-            email=validated_data["email"],
-            password=validated_data["password"],
+        user = User(
+            username=User.normalize_username(validated_data["email"]),
+            email=email,
             first_name=first_name,
             last_name=last_name,
-            name=full_name,
+            name=f"{first_name} {last_name}",
             status="active",
             is_active=True,
             invite_code=invite,
         )
-        group, _ = Group.objects.get_or_create(name="Candidate")
-        user.groups.add(group)
-        user.save()
+        # Hash before the transaction opens: it is by far the slowest step
+        user.set_password(validated_data["password"])
+        group_id = get_group_id("Candidate")
 
-        Profile.objects.create(user=user, invite_code=invite, status="draft")
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+                User.groups.through.objects.create(user_id=user.pk, group_id=group_id)
+                Profile.objects.create(user=user, invite_code=invite, status="draft")
+                # Re-checked atomically: another registration may have used the last
+                # slot. Claimed last so the invite row stays locked only until commit.
+                if not invite.claim():
+                    raise serializers.ValidationError(
+                        {"invite_code": ["Invite code is no longer available."]}
+                    )
+        except IntegrityError:
+            # A concurrent registration with the same email won the race
+            if User.objects.filter(Q(email=email) | Q(username=user.username)).exists():
+                raise serializers.ValidationError(
+                    {"email": ["A user with this email already exists."]}
+                )
+            # Anything else, e.g. a group id cached before the group was recreated
+            forget_group_id("Candidate")
+            raise
         return user
 
 
@@ -251,6 +292,7 @@ class InviteCodeSerializer(serializers.ModelSerializer):
             "code",
             "event",
             "used_count",
+            "max_uses",
             "status",
             "created_by",
             "created_by_name",
@@ -281,7 +323,7 @@ class JobSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Job
-        fields = "__all__"
+        exclude = ["search_vector"]
 
     def create(self, validated_data):
         validated_data["status"] = "pending"
@@ -325,6 +367,11 @@ class MutualInterestSerializer(serializers.ModelSerializer):
         ]
 
     def get_is_mutual(self, obj):
+        # List endpoints annotate mutuality up front (see with_is_mutual); single
+        # objects fall back to the per-instance query.
+        annotated = getattr(obj, "annotated_is_mutual", None)
+        if annotated is not None:
+            return annotated
         return obj.is_mutual
 
     def create(self, validated_data):
@@ -342,6 +389,37 @@ class MutualInterestSerializer(serializers.ModelSerializer):
         return obj.profile.user.name if obj.profile and obj.profile.user else None
 
 
+def add_claims(token, user):
+    token["groups"] = list(user.groups.values_list("name", flat=True))
+    token["church_id"] = user.church_id_id
+    return token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Add group names and church id claims so permissions can be checked from the token."""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Reload the group and church claims from the database for each new access token,
+    rather than copying them from the refresh token, so a removed group or church
+    stops authorizing stateless reads once the current access token expires.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        user = User.objects.get(
+            **{jwt_settings.USER_ID_FIELD: access[jwt_settings.USER_ID_CLAIM]}
+        )
+        data["access"] = str(add_claims(access, user))
+        return data
+
+
 class UserSummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -389,16 +467,31 @@ class ProfileSerializer(serializers.ModelSerializer):
                 )
         return data
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        new_image = validated_data.get("profile_image", None)
-        if new_image and instance.profile_image and instance.profile_image != new_image:
-            instance.profile_image.delete(save=False)  # delete old image from S3
+        replaced = []
+        for field in ("profile_image", "resume"):
+            new_file = validated_data.get(field, None)
+            old_file = getattr(instance, field)
+            if new_file and old_file and old_file != new_file:
+                replaced.append(old_file.name)
+
+        instance = super().update(instance, validated_data)
+        # Old files are deleted from S3 by process_file_deletions, and only if this
+        # update commits
+        FileDeletion.enqueue(*replaced)
+        return instance
+
 
-        new_resume = validated_data.get("resume", None)
-        if new_resume and instance.resume and instance.resume != new_resume:
-            instance.resume.delete(save=False)  # delete old resume from S3
+class ProfileUploadSerializer(serializers.Serializer):
+    field = serializers.ChoiceField(choices=list(UPLOAD_RULES))
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
 
-        return super().update(instance, validated_data)
+
+class ProfileUploadConfirmSerializer(serializers.Serializer):
+    upload_token = serializers.CharField()
 
 
 class ProfileResetSerializer(serializers.Serializer):
@@ -415,6 +508,22 @@ class ProfileStatusSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
+class RecommendedCandidateSerializer(serializers.ModelSerializer):
+    profile = ProfileSerializer(read_only=True)
+
+    class Meta:
+        model = Recommendation
+        fields = ["id", "score", "profile"]
+
+
+class RecommendedJobSerializer(serializers.ModelSerializer):
+    job = JobSerializer(read_only=True)
+
+    class Meta:
+        model = Recommendation
+        fields = ["id", "score", "job"]
+
+
 class ResetPasswordSerializer(serializers.Serializer):
     temporary_password = serializers.CharField(write_only=True)
     new_password = serializers.CharField(write_only=True)
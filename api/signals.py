@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from . import events
+from .cache import api_cache
+from .models import (
+    Church,
+    Job,
+    Match,
+    MutualInterest,
+    Profile,
+    RecommendationRefresh,
+)
+from .groups import forget_group_id
+
+# Fields that feed recommendation scores; saves touching none of them skip the refresh
+PROFILE_SCORE_FIELDS = {"status", "placement_preferences", "zipcode", "state"}
+JOB_SCORE_FIELDS = {
+    "status",
+    "church",
+    "ministry_type",
+    "employment_type",
+    "title",
+    "job_description",
+}
+
+
+@receiver(post_save, sender=MutualInterest)
+def sync_match_on_interest_save(sender, instance, raw=False, **kwargs):
+    # Fixture loading (raw) is followed by rebuild_matches instead
+    if raw:
+        return
+    Match.sync_for_interest(instance)
+
+
+@receiver(post_save, sender=MutualInterest)
+def publish_new_interest(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        events.interest_created(instance)
+
+
+@receiver(post_save, sender=Match)
+def publish_new_match(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        events.match_created(instance)
+
+
+def affects_scores(update_fields, score_fields):
+    return update_fields is None or bool(score_fields & set(update_fields))
+
+
+@receiver(post_save, sender=Profile)
+def queue_profile_recommendations(
+    sender, instance, created=False, raw=False, update_fields=None, **kwargs
+):
+    if raw or not affects_scores(update_fields, PROFILE_SCORE_FIELDS):
+        return
+    # A new draft profile (every registration) has no recommendations to refresh
+    if created and instance.status != "approved":
+        return
+    RecommendationRefresh.enqueue(RecommendationRefresh.PROFILE, instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def queue_job_recommendations(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    if raw or not affects_scores(update_fields, JOB_SCORE_FIELDS):
+        return
+    RecommendationRefresh.enqueue(RecommendationRefresh.JOB, instance.pk)
+
+
+# Fields of User rendered in approved-candidates (or filtering it); logins only touch last_login
+USER_LISTED_FIELDS = {"first_name", "last_name", "email", "name", "is_active"}
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_pages(sender, instance, **kwargs):
+    api_cache.invalidate("jobs", f"church:{instance.church_id}")
+
+
+@receiver(post_save, sender=Church)
+@receiver(post_delete, sender=Church)
+def invalidate_church_pages(sender, instance, **kwargs):
+    api_cache.invalidate("jobs", f"church:{instance.pk}")
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_candidate_pages(sender, instance, created=False, **kwargs):
+    # Only approved profiles are listed, and new ones start out as drafts
+    if created and instance.status != "approved":
+        return
+    api_cache.invalidate("candidates")
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_candidate_pages_for_user(
+    sender, created=False, update_fields=None, **kwargs
+):
+    # A new user has no approved profile yet
+    if created:
+        return
+    if update_fields is None or USER_LISTED_FIELDS & set(update_fields):
+        api_cache.invalidate("candidates")
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def forget_cached_group_id(sender, instance, **kwargs):
+    forget_group_id(instance.name)
@@ -0,0 +1,142 @@
+import threading
+import time
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.cache import ApiCache, api_cache
+from api.models import Church, Job
+
+User = get_user_model()
+
+
+class ApiCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.api_cache = ApiCache(prefix="test", poll=0.01)
+
+    def test_invalidating_a_tag_changes_only_its_keys(self):
+        church_key = self.api_cache.key("page", ["/a"], tags=["church:1"])
+        other_key = self.api_cache.key("page", ["/a"], tags=["church:2"])
+        self.api_cache.set(church_key, "church", 60)
+        self.api_cache.set(other_key, "other", 60)
+
+        self.api_cache.invalidate("church:1")
+
+        new_church_key = self.api_cache.key("page", ["/a"], tags=["church:1"])
+        self.assertNotEqual(new_church_key, church_key)
+        self.assertIsNone(self.api_cache.get(new_church_key))
+        self.assertEqual(
+            self.api_cache.key("page", ["/a"], tags=["church:2"]), other_key
+        )
+        self.assertEqual(self.api_cache.get(other_key), "other")
+
+    def test_invalidate_unknown_tag(self):
+        before = self.api_cache.key("page", tags=["jobs"])
+        cache.clear()
+        self.api_cache.invalidate("jobs")
+        self.assertNotEqual(self.api_cache.key("page", tags=["jobs"]), before)
+
+    def test_counts_hits_and_misses(self):
+        key = self.api_cache.key("value")
+        self.assertEqual(self.api_cache.get_or_set(key, lambda: 1, 60), 1)
+        self.assertEqual(self.api_cache.get_or_set(key, lambda: 2, 60), 1)
+        stats = self.api_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_concurrent_misses_compute_once(self):
+        key = self.api_cache.key("slow")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.api_cache.get_or_set(key, compute, 60)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.api_cache.stats()["waits"], 4)
+
+
+@override_settings(API_PAGE_CACHE=True)
+class ChurchTaggedPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="staff@gracefellowship.org",
+            username="staff@gracefellowship.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=self.church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.client.force_authenticate(user=self.user)
+
+    def make_job(self, church):
+        return Job.objects.create(
+            church=church,
+            title="Youth Pastor",
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Description",
+            about_church="About",
+        )
+
+    def test_my_jobs_is_invalidated_by_its_church_only(self):
+        self.make_job(self.church)
+        first = self.client.get("/api/jobs/my-jobs/")
+        self.assertEqual(first.data["count"], 1)
+
+        self.make_job(Church.objects.create(name="Other Church"))
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get("/api/jobs/my-jobs/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertFalse(any('"api_job"' in q["sql"] for q in captured))
+
+        self.make_job(self.church)
+        response = self.client.get("/api/jobs/my-jobs/")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_profiling_report_includes_cache_counters(self):
+        admin = User.objects.create_user(
+            email="admin@example.com",
+            username="admin@example.com",
+            password="securepassword",
+            name="Admin",
+            status="active",
+        )
+        admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        api_cache.reset_stats()
+        self.client.get("/api/jobs/my-jobs/")
+        self.client.get("/api/jobs/my-jobs/")
+
+        self.client.force_authenticate(user=admin)
+        report = self.client.get("/api/admin/profiling/").data["cache"]
+        self.assertEqual((report["hits"], report["misses"]), (1, 1))
+        self.assertEqual(report["backend"], "LocMemCache")
+        self.assertEqual(
+            self.client.delete("/api/admin/profiling/").status_code,
+            status.HTTP_204_NO_CONTENT,
+        )
+        self.assertEqual(api_cache.stats()["hits"], 0)
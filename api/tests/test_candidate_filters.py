@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Church, Profile
+
+User = get_user_model()
+
+
+class ApprovedCandidateFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="staff@gracefellowship.org",
+            username="staff@gracefellowship.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.client.force_authenticate(user=self.user)
+
+        self.anna = self.make_candidate(
+            "Anna Baker", "Louisville", "KY", "40202", ["Youth Ministry", "Worship"]
+        )
+        self.ben = self.make_candidate(
+            "Ben Carter", "Lexington", "KY", "40502", ["Worship"]
+        )
+        self.cara = self.make_candidate(
+            "Cara Anderson", "Nashville", "TN", "37201", ["Children's Ministry"]
+        )
+        self.make_candidate(
+            "Dan Pending", "Louisville", "KY", "40202", ["Worship"], status="pending"
+        )
+
+    def make_candidate(
+        self, name, city, state, zipcode, preferences, status="approved"
+    ):
+        email = name.lower().replace(" ", ".") + "@example.com"
+        user = User.objects.create_user(
+            email=email,
+            username=email,
+            password="securepassword",
+            name=name,
+            status="active",
+        )
+        return Profile.objects.create(
+            user=user,
+            city=city,
+            state=state,
+            zipcode=zipcode,
+            placement_preferences=preferences,
+            status=status,
+        )
+
+    def filtered_ids(self, **params):
+        response = self.client.get("/api/approved-candidates/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {r["id"] for r in response.data["results"]}
+
+    def test_filters_by_state_case_insensitively(self):
+        self.assertEqual(self.filtered_ids(state="ky"), {self.anna.id, self.ben.id})
+
+    def test_filters_by_city_case_insensitively(self):
+        self.assertEqual(self.filtered_ids(city="LOUISVILLE"), {self.anna.id})
+
+    def test_filters_by_zipcode_prefix(self):
+        self.assertEqual(self.filtered_ids(zipcode="40"), {self.anna.id, self.ben.id})
+        self.assertEqual(self.filtered_ids(zipcode="405"), {self.ben.id})
+        self.assertEqual(self.filtered_ids(zipcode="37201"), {self.cara.id})
+
+    def test_filters_by_placement_preference(self):
+        self.assertEqual(
+            self.filtered_ids(placement_preferences="Worship"),
+            {self.anna.id, self.ben.id},
+        )
+        self.assertEqual(self.filtered_ids(placement_preferences="Worsh"), set())
+
+    def test_searches_by_name(self):
+        self.assertEqual(self.filtered_ids(search="and"), {self.cara.id})
+        self.assertEqual(self.filtered_ids(search="ann baker"), {self.anna.id})
+
+    def test_filters_combine(self):
+        self.assertEqual(
+            self.filtered_ids(state="KY", placement_preferences="Youth Ministry"),
+            {self.anna.id},
+        )
+
+    def test_filters_apply_with_cursor_pagination(self):
+        response = self.client.get(
+            "/api/approved-candidates/", {"state": "KY", "pagination": "cursor"}
+        )
+        self.assertEqual(
+            {r["id"] for r in response.data["results"]}, {self.anna.id, self.ben.id}
+        )
@@ -1,9 +1,16 @@
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from api.models import InviteCode
+from api.models import InviteCode, Profile
+from api.groups import GROUP_ID_CACHE_TIMEOUT, get_group_id, group_id_key
 from rest_framework_simplejwt.tokens import RefreshToken
 
 User = get_user_model()
@@ -101,3 +108,136 @@ class CandidateRegistrationTests(TestCase):
         self.assertIn("password", response.data)
         self.assertIn("first_name", response.data)
         self.assertIn("last_name", response.data)
+
+    def test_candidate_registration_expired_invite_code(self):
+        self.invite_code.expires_at = timezone.now() - timedelta(minutes=1)
+        self.invite_code.save()
+        response = self.client.post(
+            "/api/candidates/register/", self.valid_payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("invite_code", response.data)
+
+    def test_candidate_registration_respects_max_uses(self):
+        self.invite_code.max_uses = 1
+        self.invite_code.save()
+        response = self.client.post(
+            "/api/candidates/register/", self.valid_payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        payload = {**self.valid_payload, "email": "candidate2@example.com"}
+        response = self.client.post("/api/candidates/register/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("invite_code", response.data)
+        self.assertEqual(InviteCode.objects.get(pk=self.invite_code.pk).used_count, 1)
+
+    def test_claim_cannot_exceed_max_uses_with_stale_instances(self):
+        self.invite_code.max_uses = 1
+        self.invite_code.save()
+        # Both registrations validated against the same snapshot
+        first = InviteCode.objects.get(pk=self.invite_code.pk)
+        second = InviteCode.objects.get(pk=self.invite_code.pk)
+        self.assertTrue(first.claim())
+        self.assertFalse(second.claim())
+        self.assertEqual(InviteCode.objects.get(pk=self.invite_code.pk).used_count, 1)
+
+    def test_claims_from_stale_instances_are_not_lost(self):
+        snapshots = [InviteCode.objects.get(pk=self.invite_code.pk) for _ in range(3)]
+        for invite in snapshots:
+            self.assertTrue(invite.claim())
+        self.assertEqual(InviteCode.objects.get(pk=self.invite_code.pk).used_count, 3)
+
+    def test_failed_registration_does_not_consume_invite(self):
+        with mock.patch.object(
+            Profile.objects, "create", side_effect=RuntimeError("boom")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.post(
+                    "/api/candidates/register/", self.valid_payload, format="json"
+                )
+        self.assertEqual(InviteCode.objects.get(pk=self.invite_code.pk).used_count, 0)
+        self.assertFalse(User.objects.filter(email="candidate1@example.com").exists())
+
+    def test_invite_code_is_looked_up_once(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.client.post(
+                "/api/candidates/register/", self.valid_payload, format="json"
+            )
+        lookups = [
+            q["sql"]
+            for q in captured.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "api_invitecode"' in q["sql"]
+        ]
+        self.assertEqual(len(lookups), 1)
+
+    def test_lost_claim_rolls_back_the_new_user(self):
+        with mock.patch.object(InviteCode, "claim", return_value=False):
+            response = self.client.post(
+                "/api/candidates/register/", self.valid_payload, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("invite_code", response.data)
+        self.assertFalse(User.objects.filter(email="candidate1@example.com").exists())
+
+    def test_registration_creates_candidate_membership_and_draft_profile(self):
+        self.client.post("/api/candidates/register/", self.valid_payload, format="json")
+        user = User.objects.get(email="candidate1@example.com")
+        self.assertEqual(
+            list(user.groups.values_list("name", flat=True)), ["Candidate"]
+        )
+        self.assertTrue(user.check_password("securepassword"))
+        self.assertEqual(user.name, "Jane Doe")
+        self.assertEqual(user.profile.status, "draft")
+        self.assertEqual(user.profile.invite_code, self.invite_code)
+
+    def test_registration_writes_in_one_short_transaction(self):
+        cache.delete(group_id_key("Candidate"))
+        # Warm the group id cache, as every registration after the first would
+        with self.captureOnCommitCallbacks(execute=True):
+            get_group_id("Candidate")
+        with CaptureQueriesContext(connection) as captured:
+            self.client.post(
+                "/api/candidates/register/", self.valid_payload, format="json"
+            )
+        sql = [q["sql"] for q in captured.captured_queries]
+        self.assertFalse(any('FROM "auth_group"' in q for q in sql))
+        writes = [q for q in sql if q.startswith(("INSERT", "UPDATE", "DELETE"))]
+        # user, membership, profile, then the invite claim
+        self.assertEqual(len(writes), 4)
+        self.assertTrue(writes[-1].startswith('UPDATE "api_invitecode"'))
+
+    def test_cached_group_id_is_dropped_when_the_group_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            group_id = get_group_id("Candidate")
+        self.assertEqual(cache.get(group_id_key("Candidate")), group_id)
+        Group.objects.get(pk=group_id).delete()
+        self.assertIsNone(cache.get(group_id_key("Candidate")))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertNotEqual(get_group_id("Candidate"), group_id)
+
+    def test_group_id_cache_expires(self):
+        with mock.patch.object(cache, "set") as cache_set:
+            with self.captureOnCommitCallbacks(execute=True):
+                group_id = get_group_id("Church User")
+        cache_set.assert_called_once_with(
+            group_id_key("Church User"), group_id, GROUP_ID_CACHE_TIMEOUT
+        )
+        self.assertNotIn(" ", group_id_key("Church User"))
+
+    def test_other_integrity_errors_are_not_reported_as_duplicate_email(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            get_group_id("Candidate")
+        # e.g. a foreign key violation from a group id cached by another worker
+        failure = IntegrityError("FOREIGN KEY constraint failed")
+        with mock.patch.object(
+            User.groups.through.objects, "create", side_effect=failure
+        ):
+            with self.assertRaises(IntegrityError):
+                self.client.post(
+                    "/api/candidates/register/", self.valid_payload, format="json"
+                )
+        self.assertIsNone(cache.get(group_id_key("Candidate")))
+        response = self.client.post(
+            "/api/candidates/register/", self.valid_payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
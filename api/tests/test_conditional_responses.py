@@ -0,0 +1,175 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Church, Job, Profile
+from api.serializers import ClaimsTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+@override_settings(API_PAGE_CACHE=True)
+class ConditionalListResponseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="staff@gracefellowship.org",
+            username="staff@gracefellowship.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=self.church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.job = self.make_job("Youth Pastor")
+        candidate = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate User",
+            status="active",
+        )
+        self.profile = Profile.objects.create(user=candidate, status="approved")
+
+    def make_job(self, title):
+        return Job.objects.create(
+            church=self.church,
+            title=title,
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Description",
+            about_church="About",
+            status="approved",
+        )
+
+    def test_repeat_poll_is_served_from_cache_without_queries(self):
+        for url in ("/api/jobs/approved-jobs/", "/api/approved-candidates/"):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            self.assertIn("ETag", first)
+            self.assertIn("Last-Modified", first)
+            self.assertIn("no-cache", first["Cache-Control"])
+
+            with CaptureQueriesContext(connection) as captured:
+                again = self.client.get(url)
+                not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(len(captured), 0)
+            self.assertEqual(again.json(), first.json())
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(not_modified["ETag"], first["ETag"])
+
+    def test_unchanged_page_returns_304_with_one_query_after_cache_loss(self):
+        first = self.client.get("/api/jobs/approved-jobs/")
+        # Drop the cached pages but keep the version stamps (keys are ":<version>:<key>")
+        cache.delete_many(
+            [k.split(":", 2)[2] for k in cache._cache if ":api:page:" in k]
+        )
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                "/api/jobs/approved-jobs/", HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(captured), 1)
+
+    def test_if_modified_since(self):
+        first = self.client.get("/api/approved-candidates/")
+        response = self.client.get(
+            "/api/approved-candidates/",
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_job_save_invalidates_cached_pages(self):
+        first = self.client.get("/api/jobs/approved-jobs/")
+        self.make_job("Worship Leader")
+        response = self.client.get(
+            "/api/jobs/approved-jobs/", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.data["count"], 2)
+
+    def test_church_save_invalidates_job_pages(self):
+        self.client.get("/api/jobs/approved-jobs/")
+        self.church.name = "Grace Community Church"
+        self.church.save()
+        response = self.client.get("/api/jobs/approved-jobs/")
+        self.assertEqual(
+            response.data["results"][0]["church"]["name"], "Grace Community Church"
+        )
+
+    def test_profile_delete_invalidates_candidate_pages(self):
+        first = self.client.get("/api/approved-candidates/")
+        self.assertEqual(first.data["count"], 1)
+        self.profile.delete()
+        response = self.client.get("/api/approved-candidates/")
+        self.assertEqual(response.data["count"], 0)
+
+    def test_user_deactivation_invalidates_candidate_pages(self):
+        self.client.get("/api/approved-candidates/")
+        self.profile.user.is_active = False
+        self.profile.user.save(update_fields=["is_active"])
+        response = self.client.get("/api/approved-candidates/")
+        self.assertEqual(response.data["count"], 0)
+
+    def test_query_params_are_cached_separately(self):
+        numbered = self.client.get("/api/jobs/approved-jobs/")
+        cursor = self.client.get("/api/jobs/approved-jobs/", {"pagination": "cursor"})
+        self.assertNotEqual(numbered["ETag"], cursor["ETag"])
+        self.assertIn("count", numbered.data)
+        self.assertNotIn("count", cursor.data)
+
+    @override_settings(API_PAGE_CACHE=False)
+    def test_without_page_cache_other_workers_writes_show_at_once(self):
+        first = self.client.get("/api/jobs/approved-jobs/")
+        # A write whose tag invalidation never reached this process's cache
+        Job.objects.filter(pk=self.job.pk).update(
+            title="Senior Pastor", updated_at=timezone.now()
+        )
+        response = self.client.get(
+            "/api/jobs/approved-jobs/", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "Senior Pastor")
+        self.assertEqual(
+            self.client.get(
+                "/api/jobs/approved-jobs/", HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+    @override_settings(API_PAGE_CACHE=False)
+    def test_without_page_cache_church_rename_changes_job_validators(self):
+        first = self.client.get("/api/jobs/approved-jobs/")
+        self.church.name = "Grace Community Church"
+        self.church.save()
+        response = self.client.get(
+            "/api/jobs/approved-jobs/", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(
+            response.data["results"][0]["church"]["name"], "Grace Community Church"
+        )
+
+    @override_settings(API_PAGE_CACHE=False)
+    def test_without_page_cache_user_rename_changes_candidate_validators(self):
+        first = self.client.get("/api/approved-candidates/")
+        user = self.profile.user
+        user.first_name = "Renamed"
+        user.save()
+        response = self.client.get(
+            "/api/approved-candidates/", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.data["results"][0]["user"]["first_name"], "Renamed")
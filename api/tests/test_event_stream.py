@@ -0,0 +1,208 @@
+import asyncio
+import json
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+from api import events
+from api.models import Church, Job, MutualInterest, Profile
+from api.serializers import ClaimsTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channels, event):
+        self.published.append((sorted(channels), event))
+
+
+class InProcessBrokerTests(TestCase):
+    async def test_event_published_to_several_channels_arrives_once(self):
+        broker = events.InProcessBroker()
+        subscription = broker.subscribe(["user:1", "church:2"])
+        self.assertEqual(broker.publish(["church:2", "user:1"], {"type": "x"}), 1)
+        self.assertEqual(await subscription.get(1), {"type": "x"})
+        self.assertIsNone(await subscription.get(0.01))
+
+    async def test_unsubscribed_streams_receive_nothing(self):
+        broker = events.InProcessBroker()
+        subscription = broker.subscribe(["church:2"])
+        broker.unsubscribe(subscription)
+        self.assertEqual(broker.publish(["church:2"], {"type": "x"}), 0)
+        self.assertEqual(broker.subscriptions, {})
+
+    async def test_slow_subscriber_is_flagged_instead_of_growing(self):
+        broker = events.InProcessBroker(queue_size=1)
+        subscription = broker.subscribe(["church:2"])
+        broker.publish(["church:2"], {"type": "a"})
+        broker.publish(["church:2"], {"type": "b"})
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(await subscription.get(1), {"type": "a"})
+
+    async def test_publish_from_another_thread_wakes_the_stream(self):
+        broker = events.InProcessBroker()
+        subscription = broker.subscribe(["user:1"])
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, broker.publish, ["user:1"], {"type": "x"})
+        self.assertEqual(await subscription.get(1), {"type": "x"})
+
+
+class EventPublishingTests(TestCase):
+    def setUp(self):
+        self.church = Church.objects.create(name="Test Church")
+        self.church_user = User.objects.create_user(
+            email="church@example.com",
+            username="church@example.com",
+            password="securepassword",
+            name="Church User",
+            status="active",
+            church_id=self.church,
+        )
+        self.candidate = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate",
+            status="active",
+        )
+        self.profile = Profile.objects.create(user=self.candidate, status="approved")
+        self.job = Job.objects.create(
+            church=self.church,
+            title="Youth Pastor",
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Description",
+            about_church="About",
+            status="approved",
+        )
+        self.broker = RecordingBroker()
+        patcher = mock.patch.object(events, "get_broker", return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def express(self, user, side):
+        return MutualInterest.objects.create(
+            job_listing=self.job,
+            profile=self.profile,
+            expressed_by=side,
+            expressed_by_user=user,
+        )
+
+    def test_events_wait_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.express(self.candidate, "candidate")
+        self.assertEqual(self.broker.published, [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.broker.published), 1)
+
+    def test_interest_goes_to_church_and_expressing_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            interest = self.express(self.candidate, "candidate")
+        channels, event = self.broker.published[0]
+        self.assertEqual(
+            channels, [f"church:{self.church.pk}", f"user:{self.candidate.pk}"]
+        )
+        self.assertEqual(event["type"], "interest")
+        self.assertEqual(event["id"], interest.pk)
+        self.assertEqual(event["expressed_by"], "candidate")
+
+    def test_match_goes_to_church_and_both_users(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.express(self.candidate, "candidate")
+            church_interest = self.express(self.church_user, "church")
+        matches = [e for _, e in self.broker.published if e["type"] == "match"]
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0]["church_interest"], church_interest.pk)
+        channels = [c for c, e in self.broker.published if e["type"] == "match"][0]
+        self.assertEqual(
+            channels,
+            sorted(
+                [
+                    f"church:{self.church.pk}",
+                    f"user:{self.church_user.pk}",
+                    f"user:{self.candidate.pk}",
+                ]
+            ),
+        )
+
+    def test_updates_publish_nothing(self):
+        interest = self.express(self.candidate, "candidate")
+        with self.captureOnCommitCallbacks(execute=True):
+            interest.save()
+        self.assertEqual(self.broker.published, [])
+
+
+@override_settings(EVENTS_HEARTBEAT_SECONDS=0.05)
+class EventStreamViewTests(TestCase):
+    def setUp(self):
+        self.church = Church.objects.create(name="Test Church")
+        self.user = User.objects.create_user(
+            email="church@example.com",
+            username="church@example.com",
+            password="securepassword",
+            name="Church User",
+            status="active",
+            church_id=self.church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.access_token = str(token)
+        self.broker = events.InProcessBroker()
+        patcher = mock.patch.object(events, "get_broker", return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_stream_delivers_church_events(self):
+        response = await AsyncClient().get("/api/events/", {"token": self.access_token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = response.streaming_content.__aiter__()
+        self.assertEqual(await chunks.__anext__(), b"retry: 5000\n\n")
+
+        read = asyncio.ensure_future(chunks.__anext__())
+        await asyncio.sleep(0)
+        self.broker.publish([f"church:{self.church.pk}"], {"type": "match", "id": 7})
+        chunk = (await read).decode()
+        if chunk.startswith(":"):
+            chunk = (await chunks.__anext__()).decode()
+        self.assertTrue(chunk.startswith("event: match\ndata: "))
+        self.assertEqual(
+            json.loads(chunk.split("data: ", 1)[1]), {"type": "match", "id": 7}
+        )
+
+        # A client disconnect cancels the task consuming the stream
+        pending = asyncio.ensure_future(chunks.__anext__())
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(self.broker.subscriptions, {})
+
+    async def test_idle_stream_sends_keep_alives(self):
+        response = await AsyncClient().get(
+            "/api/events/", headers={"Authorization": f"Bearer {self.access_token}"}
+        )
+        chunks = response.streaming_content.__aiter__()
+        await chunks.__anext__()
+        self.assertEqual(await chunks.__anext__(), b": keep-alive\n\n")
+        self.assertEqual(
+            set(self.broker.subscriptions),
+            {f"user:{self.user.pk}", f"church:{self.church.pk}"},
+        )
+        await chunks.aclose()
+
+    async def test_missing_or_invalid_token_is_rejected(self):
+        client = AsyncClient()
+        self.assertEqual((await client.get("/api/events/")).status_code, 401)
+        response = await client.get("/api/events/", {"token": "not-a-token"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_wsgi_requests_are_refused(self):
+        response = APIClient().get("/api/events/", {"token": self.access_token})
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,143 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api import file_deletions
+from api.models import FileDeletion, Profile
+from api.serializers import ProfileSerializer
+
+User = get_user_model()
+
+
+class FileDeletionOutboxTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate",
+            status="active",
+        )
+        self.old_resume = default_storage.save("resumes/old.pdf", ContentFile(b"old"))
+        self.old_image = default_storage.save(
+            "profile-images/old.png", ContentFile(b"png")
+        )
+        self.profile = Profile.objects.create(
+            user=self.user,
+            status="draft",
+            resume=self.old_resume,
+            profile_image=self.old_image,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def queued(self):
+        return set(FileDeletion.objects.values_list("name", flat=True))
+
+    def new_resume(self):
+        return SimpleUploadedFile("new.pdf", b"%PDF new", "application/pdf")
+
+    def test_replacing_a_resume_queues_the_old_file(self):
+        with mock.patch.object(default_storage, "delete") as delete:
+            response = self.client.patch(
+                "/api/profile/me/", {"resume": self.new_resume()}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 200)
+        delete.assert_not_called()
+        self.assertEqual(self.queued(), {self.old_resume})
+        self.assertTrue(default_storage.exists(self.old_resume))
+
+        self.assertEqual(file_deletions.process(), (1, 0))
+        self.assertFalse(default_storage.exists(self.old_resume))
+        self.assertEqual(self.queued(), set())
+
+    def test_rolled_back_update_keeps_the_old_file(self):
+        serializer = ProfileSerializer(
+            self.profile, data={"resume": self.new_resume()}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                serializer.save()
+                raise RuntimeError("later failure in the same request")
+        self.assertEqual(self.queued(), set())
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume.name, self.old_resume)
+
+    def test_reset_queues_both_files_without_touching_storage(self):
+        with mock.patch.object(default_storage, "delete") as delete:
+            Profile.reset_to_draft(self.user, None)
+        delete.assert_not_called()
+        self.assertEqual(self.queued(), {self.old_resume, self.old_image})
+
+    def test_failures_are_retried_with_backoff(self):
+        FileDeletion.enqueue(self.old_resume)
+        storage = mock.Mock(spec=["delete"])
+        storage.delete.side_effect = OSError("storage unavailable")
+
+        self.assertEqual(file_deletions.process(storage=storage), (0, 1))
+        row = FileDeletion.objects.get()
+        self.assertEqual(row.attempts, 1)
+        self.assertIn("storage unavailable", row.last_error)
+        self.assertGreater(row.next_attempt_at, timezone.now())
+        # Not due yet
+        self.assertEqual(file_deletions.process(storage=storage), (0, 0))
+
+        FileDeletion.objects.update(next_attempt_at=timezone.now())
+        storage.delete.side_effect = None
+        self.assertEqual(file_deletions.process(storage=storage), (1, 0))
+
+    def test_backoff_grows_and_is_capped(self):
+        self.assertEqual(file_deletions.retry_delay(1), timedelta(seconds=30))
+        self.assertEqual(file_deletions.retry_delay(3), timedelta(seconds=120))
+        self.assertEqual(
+            file_deletions.retry_delay(50),
+            timedelta(seconds=file_deletions.RETRY_MAX_SECONDS),
+        )
+
+    def test_s3_deletes_are_batched_per_request(self):
+        names = [f"resumes/{i}.pdf" for i in range(2500)]
+        FileDeletion.objects.bulk_create(FileDeletion(name=name) for name in names)
+        storage = mock.Mock(bucket_name="bucket")
+        client = storage.bucket.meta.client
+        client.delete_objects.return_value = {
+            "Errors": [
+                {"Key": "resumes/7.pdf", "Code": "AccessDenied", "Message": "no"}
+            ]
+        }
+
+        self.assertEqual(
+            file_deletions.process(batch_size=2500, storage=storage), (2499, 1)
+        )
+        self.assertEqual(client.delete_objects.call_count, 3)
+        sizes = [
+            len(call.kwargs["Delete"]["Objects"])
+            for call in client.delete_objects.call_args_list
+        ]
+        self.assertEqual(sizes, [1000, 1000, 500])
+        row = FileDeletion.objects.get()
+        self.assertEqual(row.name, "resumes/7.pdf")
+        self.assertIn("AccessDenied", row.last_error)
+
+    def test_command_processes_due_deletions(self):
+        FileDeletion.enqueue(self.old_resume, self.old_image)
+        out = StringIO()
+        call_command("process_file_deletions", stdout=out)
+        self.assertIn("Deleted 2 files, 0 failed", out.getvalue())
+        self.assertFalse(default_storage.exists(self.old_image))
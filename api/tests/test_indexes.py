@@ -0,0 +1,93 @@
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test import TestCase
+from api.models import Job, MutualInterest, Profile
+
+
+class ListEndpointIndexTests(TestCase):
+    """The list endpoints' filter/order patterns should be served by the composite indexes."""
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            # Tiny test tables always favour a seq scan; make the planner show its index choice
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f"Expected one of {index_names} in plan:\n{plan}",
+        )
+
+    def test_approved_jobs(self):
+        self.assertUsesIndex(
+            Job.objects.filter(status="approved").order_by("-created_at", "-id")[:50],
+            "job_approved_created_idx",
+            "job_status_created_idx",
+        )
+
+    def test_church_jobs(self):
+        self.assertUsesIndex(
+            Job.objects.filter(church_id=1).order_by("-created_at", "-id")[:50],
+            "job_church_created_idx",
+        )
+
+    def test_profiles_by_status(self):
+        self.assertUsesIndex(
+            Profile.objects.filter(status="pending").order_by("-created_at", "-id")[
+                :50
+            ],
+            "profile_status_created_idx",
+        )
+
+    def test_approved_candidates(self):
+        self.assertUsesIndex(
+            Profile.objects.select_related("user")
+            .filter(status="approved", user__is_active=True)
+            .order_by("-created_at", "-id")[:50],
+            "profile_approved_created_idx",
+            "profile_status_created_idx",
+        )
+
+    def test_interests_by_user(self):
+        self.assertUsesIndex(
+            MutualInterest.objects.filter(expressed_by_user_id=1).order_by(
+                "-created_at"
+            )[:50],
+            "interest_user_created_idx",
+        )
+
+    def test_church_side_interests_by_user(self):
+        self.assertUsesIndex(
+            MutualInterest.objects.filter(
+                expressed_by_user_id=1, expressed_by="church"
+            ).order_by("-created_at")[:50],
+            "interest_church_user_idx",
+            "interest_user_created_idx",
+        )
+
+    def approved_candidates(self):
+        return Profile.objects.filter(status="approved").order_by("-created_at", "-id")
+
+    def test_approved_candidates_by_state(self):
+        self.assertUsesIndex(
+            self.approved_candidates().filter(state="KY")[:50],
+            "profile_approved_state_idx",
+        )
+
+    def test_approved_candidates_by_city(self):
+        self.assertUsesIndex(
+            self.approved_candidates()
+            .alias(city_lower=Lower("city"))
+            .filter(city_lower="louisville")[:50],
+            "profile_approved_city_idx",
+        )
+
+    def test_approved_candidates_by_zipcode_prefix(self):
+        self.assertUsesIndex(
+            Profile.objects.filter(
+                status="approved", zipcode__gte="402", zipcode__lt="403"
+            ),
+            "profile_status_zipcode_idx",
+        )
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Church, Job
+from api.search import fts5_query
+
+User = get_user_model()
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate",
+            status="active",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = "/api/jobs/search/"
+
+    def make_job(
+        self,
+        title,
+        description="Serve our congregation",
+        about="About us",
+        status="approved",
+    ):
+        return Job.objects.create(
+            church=self.church,
+            title=title,
+            ministry_type="General",
+            employment_type="Full Time",
+            job_description=description,
+            about_church=about,
+            status=status,
+        )
+
+    def search(self, q):
+        response = self.client.get(self.url, {"q": q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [r["id"] for r in response.data["results"]]
+
+    def test_ranks_title_matches_above_body_matches(self):
+        body = self.make_job("Associate Pastor", description="Oversee youth events")
+        title = self.make_job("Youth Pastor")
+        about = self.make_job("Worship Leader", about="A church for youth and families")
+        self.make_job("Children's Director")
+
+        self.assertEqual(self.search("youth"), [title.id, body.id, about.id])
+
+    def test_matches_stems_and_prefixes(self):
+        job = self.make_job("Worship Leader", description="Leading musicians weekly")
+        self.assertEqual(self.search("musician"), [job.id])
+        self.assertEqual(self.search("worsh"), [job.id])
+
+    def test_only_approved_jobs_are_returned(self):
+        approved = self.make_job("Youth Pastor")
+        self.make_job("Youth Intern", status="pending")
+        self.assertEqual(self.search("youth"), [approved.id])
+
+    def test_index_tracks_updates_and_deletes(self):
+        job = self.make_job("Youth Pastor")
+        job.title = "Senior Pastor"
+        job.save()
+        self.assertEqual(self.search("youth"), [])
+        self.assertEqual(self.search("senior"), [job.id])
+
+        job.delete()
+        self.assertEqual(self.search("senior"), [])
+
+    def test_query_syntax_is_treated_as_text(self):
+        job = self.make_job("Youth Pastor")
+        self.assertEqual(self.search('youth"*'), [job.id])
+        self.assertEqual(self.search("(youth:"), [job.id])
+
+    def test_requires_query(self):
+        response = self.client.get(self.url, {"q": "  "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_response_includes_church_and_omits_search_vector(self):
+        self.make_job("Youth Pastor")
+        response = self.client.get(self.url, {"q": "youth"})
+        result = response.data["results"][0]
+        self.assertEqual(result["church"]["name"], "Grace Fellowship Church")
+        self.assertNotIn("search_vector", result)
+
+    def test_fts5_query_quotes_terms(self):
+        self.assertEqual(fts5_query("youth pastor"), '"youth" "pastor"*')
+        self.assertIsNone(fts5_query('"*()'))
@@ -0,0 +1,129 @@
+import threading
+from io import StringIO
+from unittest import mock, skipUnless
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from api.models import Church, Job, Match, MutualInterest, Profile
+
+User = get_user_model()
+
+
+class MatchFixtureMixin:
+    def setUp(self):
+        self.church = Church.objects.create(name="Test Church")
+        self.church_user = User.objects.create_user(
+            email="church@example.com",
+            username="church@example.com",
+            password="securepassword",
+            name="Church User",
+            status="active",
+            church_id=self.church,
+        )
+        self.candidate = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate User",
+            status="active",
+        )
+        self.profile = Profile.objects.create(user=self.candidate, status="approved")
+        self.job = Job.objects.create(
+            church=self.church,
+            title="Youth Pastor",
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Lead youth ministry",
+            about_church="A welcoming church community.",
+            status="approved",
+        )
+
+    def express(self, side):
+        return MutualInterest.objects.create(
+            job_listing=self.job,
+            profile=self.profile,
+            expressed_by=side,
+            expressed_by_user=self.church_user if side == "church" else self.candidate,
+        )
+
+
+class MatchMaintenanceTests(MatchFixtureMixin, TestCase):
+    def test_match_created_when_second_side_expresses_interest(self):
+        candidate_interest = self.express("candidate")
+        self.assertFalse(Match.objects.exists())
+
+        church_interest = self.express("church")
+        match = Match.objects.get()
+        self.assertEqual(match.church_interest, church_interest)
+        self.assertEqual(match.candidate_interest, candidate_interest)
+        self.assertEqual(match.job_listing, self.job)
+        self.assertEqual(match.profile, self.profile)
+
+    def test_resaving_interest_keeps_existing_match(self):
+        self.express("candidate")
+        church_interest = self.express("church")
+        match = Match.objects.get()
+
+        church_interest.save()
+        self.assertEqual(Match.objects.get().pk, match.pk)
+
+    def test_match_removed_when_either_side_withdraws(self):
+        self.express("candidate")
+        church_interest = self.express("church")
+        self.assertEqual(Match.objects.count(), 1)
+
+        church_interest.delete()
+        self.assertFalse(Match.objects.exists())
+
+    def test_rebuild_matches_command(self):
+        self.express("candidate")
+        self.express("church")
+        Match.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_matches", stdout=out)
+        self.assertEqual(Match.objects.count(), 1)
+        self.assertIn("created 1", out.getvalue())
+
+    def test_interest_and_match_sync_share_one_transaction(self):
+        self.express("candidate")
+        with mock.patch.object(
+            Match, "sync_for_interest", side_effect=RuntimeError("sync failed")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.express("church")
+        self.assertFalse(MutualInterest.objects.filter(expressed_by="church").exists())
+
+
+@skipUnless(
+    connection.features.has_select_for_update,
+    "SQLite serializes writers, so the two sides cannot interleave",
+)
+class ConcurrentMatchTests(MatchFixtureMixin, TransactionTestCase):
+    def test_interleaved_interests_create_the_match(self):
+        errors = []
+
+        def express(side, barrier):
+            try:
+                barrier.wait()
+                self.express(side)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        # Each round races a fresh pair; one unlucky round would lose the match
+        for _ in range(10):
+            MutualInterest.objects.all().delete()
+            barrier = threading.Barrier(2)
+            threads = [
+                threading.Thread(target=express, args=(side, barrier))
+                for side in ("church", "candidate")
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(Match.objects.count(), 1)
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -100,3 +102,137 @@ class MutualInterestMatchViewSetTests(APITestCase):
         self.client.force_authenticate(user=self.church_user)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_is_mutual_does_not_query_per_row(self):
+        """GET /api/mutual-interests/ computes is_mutual in the list query"""
+        MutualInterest.objects.create(
+            job_listing=self.job,
+            profile=self.profile,
+            expressed_by="church",
+            expressed_by_user=self.church_user,
+        )
+        MutualInterest.objects.create(
+            job_listing=self.job,
+            profile=self.profile,
+            expressed_by="candidate",
+            expressed_by_user=self.candidate,
+        )
+        url = reverse("mutual-interest-list")
+        self.client.force_authenticate(user=self.church_user)
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["results"][0]["is_mutual"])
+
+        for i in range(5):
+            job = Job.objects.create(
+                church=self.church,
+                title=f"Job {i}",
+                ministry_type="Youth",
+                employment_type="Full Time",
+                job_description="Description",
+                about_church="About",
+                status="approved",
+            )
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=self.profile,
+                expressed_by="church",
+                expressed_by_user=self.church_user,
+            )
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertEqual(response.data["count"], 6)
+        self.assertEqual(
+            [r["is_mutual"] for r in response.data["results"]].count(True), 1
+        )
+        self.assertEqual(len(many.captured_queries), len(single.captured_queries))
+
+
+class MutualInterestQueryCountTests(APITestCase):
+    """Each endpoint must load its page in a fixed number of queries, however many rows."""
+
+    def setUp(self):
+        self.church = Church.objects.create(name="Test Church")
+        self.church_user = User.objects.create_user(
+            email="church@example.com",
+            username="church@example.com",
+            password="securepassword",
+            name="Church User",
+            status="active",
+            church_id=self.church,
+        )
+        self.church_user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            username="admin@example.com",
+            password="securepassword",
+            name="Admin User",
+            status="active",
+        )
+        self.admin_user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+
+        for i in range(5):
+            candidate = User.objects.create_user(
+                email=f"candidate{i}@example.com",
+                username=f"candidate{i}@example.com",
+                password="securepassword",
+                name=f"Candidate {i}",
+                status="active",
+            )
+            profile = Profile.objects.create(user=candidate, status="approved")
+            job = Job.objects.create(
+                church=self.church,
+                title=f"Job {i}",
+                ministry_type="Youth",
+                employment_type="Full Time",
+                job_description="Description",
+                about_church="About",
+                status="approved",
+            )
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=profile,
+                expressed_by="candidate",
+                expressed_by_user=candidate,
+            )
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=profile,
+                expressed_by="church",
+                expressed_by_user=self.church_user,
+            )
+
+    def assertResultsInQueries(self, user, url_name, num_queries):
+        self.client.force_authenticate(user=user)
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 5)
+        for row in results:
+            self.assertIsNotNone(row["church_name"])
+            self.assertIsNotNone(row["candidate_name"])
+            self.assertIsNotNone(row["job_title"])
+
+    def test_list(self):
+        # count + page
+        self.assertResultsInQueries(self.church_user, "mutual-interest-list", 2)
+
+    def test_my_church_interests(self):
+        # groups + count + page
+        self.client.force_authenticate(user=self.church_user)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("mutual-interest-my-church-interests"))
+        self.assertEqual(response.data["count"], 10)
+
+    def test_mutual_matches(self):
+        # count + page
+        self.assertResultsInQueries(
+            self.church_user, "mutual-interest-mutual-matches", 2
+        )
+
+    def test_admin_matches(self):
+        # groups + cursor page
+        self.assertResultsInQueries(self.admin_user, "mutual-interest-admin-matches", 2)
@@ -0,0 +1,197 @@
+from io import StringIO
+import json
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api.models import Church, Job, Match, MutualInterest, Profile
+
+User = get_user_model()
+
+
+class MutualMatchesQueryTests(APITestCase):
+    def setUp(self):
+        self.church = Church.objects.create(name="Test Church")
+        self.church_user = User.objects.create_user(
+            email="church@example.com",
+            username="church@example.com",
+            password="securepassword",
+            name="Church User",
+            status="active",
+            church_id=self.church,
+        )
+        self.church_user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            username="admin@example.com",
+            password="securepassword",
+            name="Admin User",
+            status="active",
+        )
+        self.admin_user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+
+    def create_jobs(self, count):
+        return Job.objects.bulk_create(
+            Job(
+                church=self.church,
+                title=f"Job {i}",
+                ministry_type="Youth",
+                employment_type="Full Time",
+                job_description="Description",
+                about_church="About",
+                status="approved",
+            )
+            for i in range(count)
+        )
+
+    def create_profiles(self, count):
+        users = User.objects.bulk_create(
+            User(
+                email=f"candidate{i}@example.com",
+                username=f"candidate{i}@example.com",
+                password="!",
+                name=f"Candidate {i}",
+                status="active",
+            )
+            for i in range(count)
+        )
+        return Profile.objects.bulk_create(
+            Profile(user=user, status="approved") for user in users
+        )
+
+    def test_matches_returns_only_exact_pairs(self):
+        """Matched (job A, profile X) and (job B, profile Y) must not also return (A, Y)"""
+        job_a, job_b = self.create_jobs(2)
+        profile_x, profile_y = self.create_profiles(2)
+        for job, profile in [(job_a, profile_x), (job_b, profile_y)]:
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=profile,
+                expressed_by="candidate",
+                expressed_by_user=profile.user,
+            )
+        for job, profile in [
+            (job_a, profile_x),
+            (job_b, profile_y),
+            (job_a, profile_y),
+        ]:
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=profile,
+                expressed_by="church",
+                expressed_by_user=self.church_user,
+            )
+
+        self.client.force_authenticate(user=self.church_user)
+        response = self.client.get(reverse("mutual-interest-mutual-matches"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pairs = {(r["job_listing"], r["profile"]) for r in response.data["results"]}
+        self.assertEqual(pairs, {(job_a.id, profile_x.id), (job_b.id, profile_y.id)})
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse("mutual-interest-admin-matches"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pairs = {(r["job_listing"], r["profile"]) for r in response.data["results"]}
+        self.assertEqual(pairs, {(job_a.id, profile_x.id), (job_b.id, profile_y.id)})
+
+    def test_matches_query_count_with_10k_interests(self):
+        """A page of matches costs the same queries regardless of interest volume"""
+        jobs = self.create_jobs(100)
+        profiles = self.create_profiles(60)
+        interests = []
+        for job in jobs:
+            for i, profile in enumerate(profiles):
+                interests.append(
+                    MutualInterest(
+                        job_listing=job,
+                        profile=profile,
+                        expressed_by="church",
+                        expressed_by_user=self.church_user,
+                    )
+                )
+                if i % 3:
+                    interests.append(
+                        MutualInterest(
+                            job_listing=job,
+                            profile=profile,
+                            expressed_by="candidate",
+                            expressed_by_user=profile.user,
+                        )
+                    )
+        MutualInterest.objects.bulk_create(interests, batch_size=1000)
+        call_command("rebuild_matches", stdout=StringIO())
+        self.assertEqual(MutualInterest.objects.count(), 10000)
+        self.assertEqual(Match.objects.count(), 4000)
+
+        self.client.force_authenticate(user=self.church_user)
+        url = reverse("mutual-interest-mutual-matches")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 4000)
+        self.assertEqual(len(response.data["results"]), 50)
+        # One COUNT plus one page query; no IN lists built from prior queries
+        self.assertEqual(len(queries.captured_queries), 2)
+        for query in queries.captured_queries:
+            self.assertLess(len(query["sql"]), 4000)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"job_listing": jobs[0].id})
+        self.assertEqual(response.data["count"], 40)
+        self.assertEqual(len(queries.captured_queries), 3)
+
+    def create_matches(self, count):
+        jobs = self.create_jobs(count)
+        profiles = self.create_profiles(count)
+        for job, profile in zip(jobs, profiles):
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=profile,
+                expressed_by="candidate",
+                expressed_by_user=profile.user,
+            )
+            MutualInterest.objects.create(
+                job_listing=job,
+                profile=profile,
+                expressed_by="church",
+                expressed_by_user=self.church_user,
+            )
+
+    def test_admin_matches_cursor_pagination(self):
+        self.create_matches(3)
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse("mutual-interest-admin-matches")
+
+        response = self.client.get(url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        seen = [r["id"] for r in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen += [r["id"] for r in response.data["results"]]
+        church_side = MutualInterest.objects.filter(expressed_by="church")
+        self.assertEqual(
+            seen,
+            list(
+                church_side.order_by("-created_at", "-id").values_list("id", flat=True)
+            ),
+        )
+
+    def test_admin_matches_ndjson_stream(self):
+        self.create_matches(3)
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(
+            reverse("mutual-interest-admin-matches"), {"stream": "true"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row["is_mutual"] for row in rows))
+        self.assertTrue(all(row["expressed_by"] == "church" for row in rows))
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Church, Job, Profile
+
+User = get_user_model()
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="staff@gracefellowship.org",
+            username="staff@gracefellowship.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=self.church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.client.force_authenticate(user=self.user)
+        for i in range(5):
+            Job.objects.create(
+                church=self.church,
+                title=f"Job {i}",
+                ministry_type="Youth",
+                employment_type="Full Time",
+                job_description="Description",
+                about_church="About",
+                status="approved",
+            )
+            candidate = User.objects.create_user(
+                email=f"candidate{i}@example.com",
+                username=f"candidate{i}@example.com",
+                password="securepassword",
+                name=f"Candidate {i}",
+                status="active",
+            )
+            Profile.objects.create(user=candidate, status="approved")
+
+    def collect_cursor_pages(self, url):
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        ids = [r["id"] for r in response.data["results"]]
+        pages = 1
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids += [r["id"] for r in response.data["results"]]
+            pages += 1
+        self.assertEqual(pages, 3)
+        return ids
+
+    def test_approved_jobs_cursor_pages(self):
+        ids = self.collect_cursor_pages("/api/jobs/approved-jobs/")
+        expected = Job.objects.order_by("-created_at", "-id").values_list(
+            "id", flat=True
+        )
+        self.assertEqual(ids, list(expected))
+
+    def test_my_jobs_cursor_pages(self):
+        ids = self.collect_cursor_pages("/api/jobs/my-jobs/")
+        self.assertEqual(len(ids), 5)
+
+    def test_approved_candidates_cursor_pages(self):
+        ids = self.collect_cursor_pages("/api/approved-candidates/")
+        expected = Profile.objects.order_by("-created_at", "-id").values_list(
+            "id", flat=True
+        )
+        self.assertEqual(ids, list(expected))
+
+    def test_page_number_remains_default(self):
+        response = self.client.get("/api/jobs/approved-jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
+        self.assertIsNone(response.data["previous"])
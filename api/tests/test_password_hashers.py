@@ -0,0 +1,95 @@
+import json
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+TUNED_HASHERS = [
+    "api.hashers.TunedPBKDF2PasswordHasher",
+    "api.hashers.TunedScryptPasswordHasher",
+    "api.hashers.TunedArgon2PasswordHasher",
+]
+FAST = {
+    "PASSWORD_PBKDF2_ITERATIONS": 1000,
+    "PASSWORD_SCRYPT_WORK_FACTOR": 2**10,
+    "PASSWORD_SCRYPT_PARALLELISM": 1,
+}
+
+
+@override_settings(PASSWORD_HASHERS=TUNED_HASHERS, **FAST)
+class PasswordHasherProfileTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="login@example.com",
+            email="login@example.com",
+            password="securepassword",
+            name="Login User",
+            status="active",
+        )
+
+    def login(self):
+        return self.client.post(
+            "/api/token/",
+            {"email": "login@example.com", "password": "securepassword"},
+            format="json",
+        )
+
+    def stored_hash(self):
+        return User.objects.values_list("password", flat=True).get(pk=self.user.pk)
+
+    def test_new_passwords_use_configured_parameters(self):
+        self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$1000$"))
+
+    def test_login_upgrades_hash_to_new_iteration_count(self):
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+            self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$2000$"))
+
+    def test_login_upgrades_hash_to_new_profile(self):
+        scrypt_first = [TUNED_HASHERS[1], TUNED_HASHERS[0], TUNED_HASHERS[2]]
+        with self.settings(PASSWORD_HASHERS=scrypt_first):
+            self.assertEqual(self.login().status_code, 200)
+            self.assertEqual(identify_hasher(self.stored_hash()).algorithm, "scrypt")
+            self.assertEqual(self.login().status_code, 200)
+
+    def test_failed_login_keeps_stored_hash(self):
+        stored = self.stored_hash()
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            response = self.client.post(
+                "/api/token/",
+                {"email": "login@example.com", "password": "wrong"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.stored_hash(), stored)
+
+    def test_scrypt_verifies_hashes_above_openssl_default_memory_limit(self):
+        with self.settings(PASSWORD_SCRYPT_WORK_FACTOR=2**15):
+            encoded = make_password("pw", hasher="scrypt")
+        hasher = identify_hasher(encoded)
+        self.assertTrue(hasher.verify("pw", encoded))
+        self.assertTrue(hasher.must_update(encoded))
+
+    def test_benchmark_command_reports_each_profile(self):
+        out = StringIO()
+        call_command(
+            "benchmark_hashers",
+            "--seconds",
+            "0.01",
+            "--profile",
+            "pbkdf2",
+            "--profile",
+            "scrypt",
+            stdout=out,
+        )
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report["profiles"]), {"pbkdf2", "scrypt"})
+        pbkdf2 = report["profiles"]["pbkdf2"]
+        self.assertEqual(pbkdf2["parameters"], {"iterations": 1000})
+        self.assertGreater(pbkdf2["hashes_per_sec_per_core"], 0)
+        self.assertIn("iterations", report["pbkdf2_iterations_for_target"])
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Church, Job
+
+User = get_user_model()
+
+
+def group_queries(captured):
+    return [q for q in captured.captured_queries if '"auth_group"' in q["sql"]]
+
+
+class GroupMembershipCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="staff@gracefellowship.org",
+            username="staff@gracefellowship.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=self.church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.client.force_authenticate(user=self.user)
+        self.job = Job.objects.create(
+            church=self.church,
+            title="Youth Pastor",
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Lead our youth ministry...",
+            about_church="Grace Fellowship is a vibrant church...",
+            status="pending",
+        )
+
+    def test_object_permission_checks_load_groups_once(self):
+        """DELETE runs has_permission and has_object_permission twice on one lookup"""
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.delete(f"/api/jobs/{self.job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(group_queries(captured)), 1)
+
+    def test_user_list_scoping_reuses_group_lookup(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/users/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["email"], self.user.email)
+        # One for the membership check, one for the serialized groups field
+        self.assertLessEqual(len(group_queries(captured)), 2)
+
+    def test_other_church_object_is_forbidden(self):
+        other_church = Church.objects.create(name="Other Church")
+        self.job.church = other_church
+        self.job.save()
+        response = self.client.delete(f"/api/jobs/{self.job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,168 @@
+import shutil
+import tempfile
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from api import uploads
+from api.models import FileDeletion, Profile
+
+User = get_user_model()
+
+
+@override_settings(UPLOAD_PRESIGNER="api.uploads.LocalPresigner")
+class PresignedUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate",
+            status="active",
+        )
+        self.profile = Profile.objects.create(user=self.user, status="draft")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def request_upload(self, **overrides):
+        payload = {
+            "field": "resume",
+            "filename": "My Resume.pdf",
+            "content_type": "application/pdf",
+            "size": 1024,
+            **overrides,
+        }
+        return self.client.post("/api/profile/me/uploads/", payload, format="json")
+
+    def post_file(self, upload, content=b"%PDF-1.4 resume", name="resume.pdf"):
+        # Posted like a browser form to S3: presigned fields first, then the file
+        return APIClient().post(
+            upload["url"],
+            {
+                **upload["fields"],
+                "file": SimpleUploadedFile(name, content, "application/pdf"),
+            },
+            format="multipart",
+        )
+
+    def confirm(self, upload):
+        return self.client.post(
+            "/api/profile/me/uploads/confirm/",
+            {"upload_token": upload["upload_token"]},
+            format="json",
+        )
+
+    def test_upload_is_scoped_to_the_field_prefix(self):
+        response = self.request_upload()
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data["key"].startswith("resumes/"))
+        self.assertTrue(response.data["key"].endswith("/My_Resume.pdf"))
+        image = self.request_upload(
+            field="profile_image", filename="me.png", content_type="image/png"
+        )
+        self.assertTrue(image.data["key"].startswith("profile-images/"))
+
+    def test_full_flow_attaches_uploaded_file(self):
+        upload = self.request_upload().data
+        self.assertEqual(self.post_file(upload).status_code, 204)
+        response = self.confirm(upload)
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume.name, upload["key"])
+        self.assertEqual(self.profile.resume.read(), b"%PDF-1.4 resume")
+
+    def test_confirm_before_upload_is_rejected(self):
+        upload = self.request_upload().data
+        response = self.confirm(upload)
+        self.assertEqual(response.status_code, 400)
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.resume)
+
+    def test_replacing_a_file_queues_the_old_one_for_deletion(self):
+        old_name = default_storage.save("resumes/old.pdf", ContentFile(b"old"))
+        self.profile.resume = old_name
+        self.profile.save()
+        upload = self.request_upload().data
+        self.post_file(upload)
+        self.confirm(upload)
+        self.assertEqual(
+            list(FileDeletion.objects.values_list("name", flat=True)), [old_name]
+        )
+
+    def test_tokens_are_single_use(self):
+        first = self.request_upload().data
+        self.post_file(first)
+        self.assertEqual(self.confirm(first).status_code, 200)
+        second = self.request_upload().data
+        self.post_file(second)
+        self.assertEqual(self.confirm(second).status_code, 200)
+
+        # Replaying the first token would re-attach a key queued for deletion
+        self.assertEqual(self.confirm(first).status_code, 400)
+        self.assertEqual(self.confirm(second).status_code, 400)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume.name, second["key"])
+        self.assertEqual(
+            list(FileDeletion.objects.values_list("name", flat=True)), [first["key"]]
+        )
+
+    def test_token_belongs_to_the_requesting_user(self):
+        upload = self.request_upload().data
+        self.post_file(upload)
+        other = User.objects.create_user(
+            email="other@example.com",
+            username="other@example.com",
+            password="securepassword",
+            name="Other",
+            status="active",
+        )
+        Profile.objects.create(user=other, status="draft")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.confirm(upload).status_code, 400)
+
+    def test_disallowed_types_and_sizes_are_rejected(self):
+        self.assertEqual(self.request_upload(filename="resume.exe").status_code, 400)
+        self.assertEqual(self.request_upload(content_type="text/html").status_code, 400)
+        too_big = uploads.UPLOAD_RULES["resume"]["max_bytes"] + 1
+        self.assertEqual(self.request_upload(size=too_big).status_code, 400)
+        self.assertEqual(self.request_upload(field="video").status_code, 400)
+
+    def test_local_stand_in_enforces_the_policy(self):
+        upload = self.request_upload().data
+        tampered = {**upload, "fields": {**upload["fields"], "key": "resumes/x.pdf"}}
+        self.assertEqual(self.post_file(tampered).status_code, 400)
+        with mock.patch.dict(uploads.UPLOAD_RULES["resume"], {"max_bytes": 4}):
+            small = self.request_upload(size=4).data
+        self.assertEqual(self.post_file(small).status_code, 400)
+
+    @override_settings(UPLOAD_PRESIGNER="api.uploads.S3Presigner")
+    def test_s3_presigner_signs_a_scoped_post(self):
+        client = mock.Mock()
+        client.generate_presigned_post.return_value = {
+            "url": "https://bucket.s3.amazonaws.com/",
+            "fields": {"key": "k", "policy": "p"},
+        }
+        storage = mock.Mock(bucket_name="bucket")
+        storage.bucket.meta.client = client
+        with mock.patch.object(uploads, "field_storage", return_value=storage):
+            response = self.request_upload()
+        self.assertEqual(response.data["url"], "https://bucket.s3.amazonaws.com/")
+        kwargs = client.generate_presigned_post.call_args.kwargs
+        self.assertEqual(kwargs["Bucket"], "bucket")
+        self.assertTrue(kwargs["Key"].startswith("resumes/"))
+        self.assertIn(
+            ["content-length-range", 1, uploads.UPLOAD_RULES["resume"]["max_bytes"]],
+            kwargs["Conditions"],
+        )
+        # The app server refuses to stand in for S3
+        local = {**response.data, "url": "/api/uploads/local/"}
+        self.assertEqual(self.post_file(local).status_code, 404)
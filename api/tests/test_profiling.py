@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from api import profiling
+from api.models import Church, Job
+
+User = get_user_model()
+
+
+class QueryProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        profiling.store.clear()
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        Job.objects.create(
+            church=self.church,
+            title="Youth Pastor",
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Lead our youth ministry...",
+            about_church="Grace Fellowship is a vibrant church...",
+            status="approved",
+        )
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            username="admin@example.com",
+            password="securepassword",
+            name="Admin User",
+            status="active",
+        )
+        self.admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        self.client.force_authenticate(user=self.admin)
+
+    def test_disabled_by_default(self):
+        response = self.client.get("/api/jobs/approved-jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+        response = self.client.get("/api/admin/profiling/")
+        self.assertEqual(response.data["enabled"], False)
+        self.assertEqual(response.data["endpoints"], {})
+
+    @override_settings(API_PROFILING=True)
+    def test_server_timing_header_and_report(self):
+        for _ in range(3):
+            response = self.client.get("/api/jobs/approved-jobs/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('queries"', response["Server-Timing"])
+        self.assertIn("serialize;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+        response = self.client.get("/api/admin/profiling/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        endpoint = response.data["endpoints"]["job-approved-jobs"]
+        self.assertEqual(endpoint["requests"], 3)
+        self.assertGreater(endpoint["avg_queries"], 0)
+        self.assertGreater(endpoint["avg_response_bytes"], 0)
+        self.assertLessEqual(endpoint["p50_ms"], endpoint["p95_ms"])
+
+        response = self.client.delete("/api/admin/profiling/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        # Only the DELETE itself has been recorded since the reset
+        self.assertEqual(
+            list(profiling.store.report()["endpoints"]), ["profiling-report"]
+        )
+
+    def test_report_is_admin_only(self):
+        user = User.objects.create_user(
+            email="staff@example.com",
+            username="staff@example.com",
+            password="securepassword",
+            name="Staff",
+            status="active",
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/admin/profiling/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
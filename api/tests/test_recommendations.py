@@ -0,0 +1,267 @@
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from api import recommendations
+from api.models import Church, Job, Profile, Recommendation, RecommendationRefresh
+
+User = get_user_model()
+
+
+class RecommendationTestMixin:
+    def setUp(self):
+        call_command("load_zip_centroids", stdout=StringIO())
+        self.louisville = Church.objects.create(
+            name="Louisville Church", zipcode="40202", state="KY"
+        )
+        self.nashville = Church.objects.create(
+            name="Nashville Church", zipcode="37201", state="TN"
+        )
+        self.count = 0
+
+    def make_job(self, church, ministry_type, title="Pastor", job_status="approved"):
+        return Job.objects.create(
+            church=church,
+            title=title,
+            ministry_type=ministry_type,
+            employment_type="Full Time",
+            job_description="Serve our congregation.",
+            about_church="About",
+            status=job_status,
+        )
+
+    def make_profile(self, preferences, zipcode="40207", profile_status="approved"):
+        self.count += 1
+        email = f"candidate{self.count}@example.com"
+        user = User.objects.create_user(
+            email=email, username=email, password="x", name="Candidate", status="active"
+        )
+        return Profile.objects.create(
+            user=user,
+            zipcode=zipcode,
+            state="KY",
+            placement_preferences=preferences,
+            status=profile_status,
+        )
+
+    def stored(self):
+        return {(r.profile_id, r.job_id): r.score for r in Recommendation.objects.all()}
+
+
+class ScoringTests(RecommendationTestMixin, TestCase):
+    def test_score_components(self):
+        job = recommendations.JobFeatures(
+            1, "Youth", "Full Time", "Youth Pastor", "Lead students", "40202", "KY"
+        )
+        near = recommendations.ProfileFeatures(
+            1, ["Youth Ministry", "Worship"], "40207", "KY"
+        )
+        far = recommendations.ProfileFeatures(2, ["Youth Ministry"], "63101", "MO")
+        centroids = recommendations.load_centroids(["40202", "40207", "63101"])
+
+        near_score = recommendations.score_pair(near, job, centroids)
+        far_score = recommendations.score_pair(far, job, centroids)
+        self.assertGreater(near_score, far_score)
+        # Full preference match plus half the preference words in the job text
+        self.assertAlmostEqual(
+            far_score,
+            recommendations.PREFERENCE_WEIGHT + recommendations.TEXT_WEIGHT,
+        )
+
+    def test_pairs_sharing_no_words_cannot_qualify(self):
+        self.assertGreater(recommendations.MIN_SCORE, recommendations.LOCATION_WEIGHT)
+
+    def test_rebuild_stores_ranked_qualifying_pairs(self):
+        youth_near = self.make_job(self.louisville, "Youth", "Youth Pastor")
+        youth_far = self.make_job(self.nashville, "Youth", "Youth Pastor")
+        self.make_job(self.louisville, "Worship", "Worship Leader")
+        self.make_job(self.louisville, "Youth", job_status="pending")
+        profile = self.make_profile(["Youth Ministry"])
+        self.make_profile(["Youth"], profile_status="draft")
+
+        call_command("rebuild_recommendations", stdout=StringIO())
+
+        ranked = list(
+            Recommendation.objects.filter(profile=profile)
+            .order_by("-score")
+            .values_list("job_id", flat=True)
+        )
+        self.assertEqual(ranked, [youth_near.id, youth_far.id])
+
+    def test_rebuild_keeps_best_jobs_per_profile(self):
+        for _ in range(4):
+            self.make_job(self.louisville, "Youth")
+        profile = self.make_profile(["Youth"])
+        with mock.patch.object(recommendations, "PER_PROFILE", 2):
+            recommendations.rebuild()
+        self.assertEqual(Recommendation.objects.filter(profile=profile).count(), 2)
+
+
+class IncrementalRefreshTests(RecommendationTestMixin, TestCase):
+    def queued(self):
+        return set(RecommendationRefresh.objects.values_list("kind", "object_id"))
+
+    def test_profile_save_queues_a_refresh_of_its_rows(self):
+        youth = self.make_job(self.louisville, "Youth")
+        worship = self.make_job(self.louisville, "Worship")
+        profile = self.make_profile(["Youth"])
+        self.assertIn(("profile", profile.id), self.queued())
+        recommendations.process_pending()
+        self.assertEqual(set(self.stored()), {(profile.id, youth.id)})
+        self.assertEqual(self.queued(), set())
+
+        profile.placement_preferences = ["Worship"]
+        profile.save()
+        recommendations.process_pending()
+        self.assertEqual(set(self.stored()), {(profile.id, worship.id)})
+
+        profile.status = "rejected"
+        profile.save()
+        recommendations.process_pending()
+        self.assertEqual(self.stored(), {})
+
+    def test_job_save_queues_instead_of_scoring_profiles(self):
+        profile = self.make_profile(["Youth"])
+        recommendations.process_pending()
+        with mock.patch.object(recommendations, "refresh_job") as refresh_job:
+            job = self.make_job(self.louisville, "Youth")
+            job.status = "pending"
+            job.save()
+        refresh_job.assert_not_called()
+        self.assertEqual(self.queued(), {("job", job.id)})
+
+        job.status = "approved"
+        job.save()
+        self.assertEqual(recommendations.process_pending(), 1)
+        self.assertEqual(set(self.stored()), {(profile.id, job.id)})
+
+        job.status = "draft"
+        job.save()
+        recommendations.process_pending()
+        self.assertEqual(self.stored(), {})
+
+    def test_job_refresh_respects_per_profile_limit(self):
+        profile = self.make_profile(["Youth"], zipcode="37201")
+        with mock.patch.object(recommendations, "PER_PROFILE", 2):
+            far_jobs = [self.make_job(self.nashville, "Youth") for _ in range(2)]
+            recommendations.rebuild()
+            near = self.make_job(self.louisville, "Youth")
+            recommendations.refresh_job(near.id)
+        self.assertEqual(Recommendation.objects.filter(profile=profile).count(), 2)
+        self.assertNotIn((profile.id, near.id), self.stored())
+        self.assertIn((profile.id, far_jobs[0].id), self.stored())
+
+    def test_unrelated_update_fields_skip_refresh(self):
+        profile = self.make_profile(["Youth"])
+        RecommendationRefresh.objects.all().delete()
+        profile.save(update_fields=["phone"])
+        self.assertEqual(self.queued(), set())
+
+    def test_failed_refresh_does_not_block_the_queue(self):
+        profile = self.make_profile(["Youth"])
+        job = self.make_job(self.louisville, "Youth")
+        with mock.patch.object(
+            recommendations, "refresh_job", side_effect=RuntimeError("boom")
+        ):
+            with self.assertLogs("api.recommendations", "ERROR"):
+                recommendations.process_pending()
+        self.assertEqual(self.queued(), set())
+        self.assertEqual(set(self.stored()), {(profile.id, job.id)})
+
+    def test_rebuild_clears_the_queue(self):
+        self.make_profile(["Youth"])
+        self.make_job(self.louisville, "Youth")
+        recommendations.rebuild()
+        self.assertEqual(self.queued(), set())
+
+    def test_command_processes_pending_refreshes(self):
+        profile = self.make_profile(["Youth"])
+        job = self.make_job(self.louisville, "Youth")
+        out = StringIO()
+        call_command("rebuild_recommendations", pending=True, stdout=out)
+        self.assertIn("for 2 queued jobs and profiles", out.getvalue())
+        self.assertEqual(set(self.stored()), {(profile.id, job.id)})
+
+
+class RecommendationEndpointTests(RecommendationTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.church_user = User.objects.create_user(
+            email="staff@example.org",
+            username="staff@example.org",
+            password="x",
+            name="Staff",
+            status="active",
+            church_id=self.louisville,
+        )
+        self.church_user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+
+    def test_recommended_candidates_for_job(self):
+        job = self.make_job(self.louisville, "Youth")
+        best = self.make_profile(["Youth"], zipcode="40202")
+        other = self.make_profile(["Youth"], zipcode="42101")
+        for i in range(3):
+            self.make_profile(["Youth"], zipcode="40207")
+        recommendations.rebuild()
+
+        self.client.force_authenticate(user=self.church_user)
+        url = f"/api/jobs/{job.id}/recommended-candidates/"
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.data["results"]
+        self.assertEqual(first_page[0]["profile"]["id"], best.id)
+        self.assertGreaterEqual(first_page[0]["score"], first_page[1]["score"])
+
+        ids = [r["profile"]["id"] for r in first_page]
+        next_url = response.data["next"]
+        while next_url:
+            response = self.client.get(next_url)
+            ids += [r["profile"]["id"] for r in response.data["results"]]
+            next_url = response.data["next"]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids[-1], other.id)
+
+        with CaptureQueriesContext(connection) as bigger:
+            self.client.get(url, {"page_size": 5})
+        self.assertEqual(len(bigger), len(captured))
+
+    def test_rows_awaiting_a_refresh_are_hidden(self):
+        job = self.make_job(self.louisville, "Youth")
+        profile = self.make_profile(["Youth"])
+        recommendations.rebuild()
+        profile.status = "rejected"
+        profile.save()
+
+        self.client.force_authenticate(user=self.church_user)
+        response = self.client.get(f"/api/jobs/{job.id}/recommended-candidates/")
+        self.assertEqual(response.data["results"], [])
+
+    def test_other_church_cannot_see_job_recommendations(self):
+        job = self.make_job(self.nashville, "Youth")
+        self.client.force_authenticate(user=self.church_user)
+        response = self.client.get(f"/api/jobs/{job.id}/recommended-candidates/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_recommended_jobs_for_current_candidate(self):
+        near = self.make_job(self.louisville, "Youth")
+        far = self.make_job(self.nashville, "Youth")
+        profile = self.make_profile(["Youth"])
+        recommendations.rebuild()
+
+        self.client.force_authenticate(user=profile.user)
+        response = self.client.get("/api/profile/me/recommended-jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r["job"]["id"] for r in response.data["results"]], [near.id, far.id]
+        )
+        self.assertEqual(
+            response.data["results"][0]["job"]["church"]["name"], "Louisville Church"
+        )
@@ -0,0 +1,88 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from api.models import Church, Job, Match, MutualInterest, Profile
+from api.seeding import seed_dataset
+
+User = get_user_model()
+
+
+class SeedDatasetTests(TestCase):
+    def test_seed_dataset_counts_and_roles(self):
+        users = seed_dataset(churches=3, jobs_per_church=2, profiles=10, interests=20)
+        self.assertEqual(Church.objects.count(), 3)
+        self.assertEqual(Job.objects.count(), 6)
+        self.assertEqual(Profile.objects.count(), 10)
+        self.assertGreaterEqual(MutualInterest.objects.count(), 20)
+        self.assertTrue(users["admin"].groups.filter(name="Admin").exists())
+        self.assertTrue(users["church_user"].groups.filter(name="Church User").exists())
+        self.assertTrue(
+            users["candidate_user"].groups.filter(name="Candidate").exists()
+        )
+
+        pairs = MutualInterest.objects.values("job_listing", "profile")
+        both_sides = {
+            (p["job_listing"], p["profile"])
+            for p in pairs
+            if pairs.filter(**p).count() == 2
+        }
+        self.assertEqual(Match.objects.count(), len(both_sides))
+
+    def test_seed_dataset_is_deterministic(self):
+        seed_dataset(churches=2, jobs_per_church=2, profiles=5, interests=8, seed=7)
+        first = list(
+            MutualInterest.objects.order_by("id").values_list(
+                "job_listing__title", "profile__user__email", "expressed_by"
+            )
+        )
+        for model in (MutualInterest, Job, Profile, Church):
+            model.objects.all().delete()
+        User.objects.all().delete()
+
+        seed_dataset(churches=2, jobs_per_church=2, profiles=5, interests=8, seed=7)
+        second = list(
+            MutualInterest.objects.order_by("id").values_list(
+                "job_listing__title", "profile__user__email", "expressed_by"
+            )
+        )
+        self.assertEqual(first, second)
+
+
+class SeedDataCommandTests(TestCase):
+    def test_seed_data_command(self):
+        out = StringIO()
+        call_command(
+            "seed_data",
+            churches=2,
+            jobs_per_church=3,
+            profiles=25,
+            interests=40,
+            batch_size=10,
+            password="seedpassword",
+            stdout=out,
+        )
+        self.assertEqual(Profile.objects.count(), 25)
+        self.assertEqual(MutualInterest.objects.count(), 40)
+        self.assertIn("profiles: 25/25 (100%)", out.getvalue())
+
+        candidate = User.objects.get(email="candidate3@seed.example.com")
+        self.assertTrue(candidate.check_password("seedpassword"))
+        self.assertTrue(candidate.groups.filter(name="Candidate").exists())
+        self.assertEqual(len(candidate.profile.placement_preferences), 2)
+
+        # Every seeded user shares the one precomputed hash
+        self.assertEqual(
+            User.objects.filter(email__endswith="@seed.example.com")
+            .values("password")
+            .distinct()
+            .count(),
+            1,
+        )
+
+    def test_seed_data_refuses_to_run_twice(self):
+        call_command(
+            "seed_data", churches=1, profiles=1, interests=1, stdout=StringIO()
+        )
+        with self.assertRaises(CommandError):
+            call_command("seed_data", churches=1, profiles=1, interests=1)
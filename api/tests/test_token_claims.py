@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from api.models import Church, Profile
+
+User = get_user_model()
+
+
+class TokenClaimsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Grace Fellowship Church")
+        self.user = User.objects.create_user(
+            email="staff@gracefellowship.org",
+            username="staff@gracefellowship.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=self.church,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        candidate = User.objects.create_user(
+            email="candidate@example.com",
+            username="candidate@example.com",
+            password="securepassword",
+            name="Candidate User",
+            status="active",
+        )
+        Profile.objects.create(user=candidate, status="approved")
+
+    def obtain_access_token(self):
+        response = self.client.post(
+            "/api/token/",
+            {"email": "staff@gracefellowship.org", "password": "securepassword"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["access"]
+
+    def test_token_includes_group_and_church_claims(self):
+        token = AccessToken(self.obtain_access_token())
+        self.assertEqual(token["groups"], ["Church User"])
+        self.assertEqual(token["church_id"], self.church.id)
+
+    def test_refreshed_token_keeps_claims(self):
+        response = self.client.post(
+            "/api/token/",
+            {"email": "staff@gracefellowship.org", "password": "securepassword"},
+            format="json",
+        )
+        response = self.client.post(
+            "/api/token/refresh/", {"refresh": response.data["refresh"]}, format="json"
+        )
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["groups"], ["Church User"])
+
+    def test_refresh_reloads_claims_from_the_database(self):
+        response = self.client.post(
+            "/api/token/",
+            {"email": "staff@gracefellowship.org", "password": "securepassword"},
+            format="json",
+        )
+        self.user.groups.clear()
+        self.user.church_id = None
+        self.user.save()
+
+        response = self.client.post(
+            "/api/token/refresh/", {"refresh": response.data["refresh"]}, format="json"
+        )
+        access = response.data["access"]
+        token = AccessToken(access)
+        self.assertEqual(token["groups"], [])
+        self.assertIsNone(token["church_id"])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = self.client.get("/api/approved-candidates/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_approved_candidates_authorizes_without_user_or_group_queries(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.obtain_access_token()}"
+        )
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/approved-candidates/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        auth_queries = [
+            q["sql"]
+            for q in captured.captured_queries
+            if '"auth_group"' in q["sql"] or 'FROM "api_user"' in q["sql"]
+        ]
+        self.assertEqual(auth_queries, [])
+
+    def test_approved_jobs_accepts_stateless_token(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.obtain_access_token()}"
+        )
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/jobs/approved-jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any('FROM "api_user"' in q["sql"] for q in captured.captured_queries)
+        )
+
+    def test_token_without_claims_falls_back_to_group_lookup(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get("/api/approved-candidates/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_candidate_token_is_forbidden_from_approved_candidates(self):
+        response = self.client.post(
+            "/api/token/",
+            {"email": "candidate@example.com", "password": "securepassword"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response = self.client.get("/api/approved-candidates/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
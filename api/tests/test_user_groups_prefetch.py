@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Church
+
+User = get_user_model()
+
+
+class UserGroupsPrefetchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.church = Church.objects.create(name="Test Church")
+        self.church_group = Group.objects.get_or_create(name="Church User")[0]
+        admin_group = Group.objects.get_or_create(name="Admin")[0]
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            username="admin@example.com",
+            password="securepassword",
+            name="Admin User",
+            status="active",
+        )
+        self.admin.groups.add(admin_group)
+        self.client.force_authenticate(user=self.admin)
+
+    def create_church_users(self, count):
+        start = User.objects.filter(church_id=self.church).count()
+        for i in range(start, start + count):
+            user = User.objects.create_user(
+                email=f"staff{i}@church.org",
+                username=f"staff{i}@church.org",
+                password="securepassword",
+                name=f"Staff {i}",
+                status="active",
+                church_id=self.church,
+            )
+            user.groups.add(self.church_group)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(captured.captured_queries)
+
+    def test_user_list_query_count_is_constant(self):
+        self.create_church_users(1)
+        _, baseline = self.count_queries("/api/users/")
+        self.create_church_users(5)
+        response, queries = self.count_queries("/api/users/")
+        self.assertEqual(queries, baseline)
+        groups = {r["email"]: r["groups"] for r in response.data["results"]}
+        self.assertEqual(groups["staff0@church.org"], ["Church User"])
+
+    def test_church_users_action_lists_church_users(self):
+        self.create_church_users(3)
+        User.objects.create_user(
+            email="other@example.com",
+            username="other@example.com",
+            password="securepassword",
+            name="Other User",
+            status="active",
+        )
+        url = f"/api/churches/{self.church.id}/users/"
+        response, baseline = self.count_queries(url)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(response.data["results"][0]["groups"], ["Church User"])
+
+        self.create_church_users(6)
+        response, queries = self.count_queries(url)
+        self.assertEqual(response.data["count"], 9)
+        self.assertEqual(queries, baseline)
@@ -0,0 +1,141 @@
+import os
+import tempfile
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.geo import bounding_box, haversine_miles, zipcodes_within
+from api.models import Church, Job, Profile, ZipCentroid
+
+User = get_user_model()
+
+
+class ZipCentroidLoaderTests(TestCase):
+    def test_loads_bundled_sample(self):
+        call_command("load_zip_centroids", stdout=StringIO())
+        self.assertTrue(ZipCentroid.objects.filter(zipcode="40202").exists())
+
+    def test_loads_census_gazetteer_format_and_replaces_rows(self):
+        ZipCentroid.objects.create(zipcode="99999", latitude=0, longitude=0)
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(
+                "GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG        \n"
+                "00601\t166847909\t799292\t64.42\t0.309\t18.180555\t-66.749961\n"
+                "40202\t4562313\t387010\t1.761\t0.149\t38.252900\t-85.751300\n"
+            )
+        self.addCleanup(os.remove, f.name)
+        call_command("load_zip_centroids", file=f.name, stdout=StringIO())
+        self.assertEqual(
+            set(ZipCentroid.objects.values_list("zipcode", flat=True)),
+            {"00601", "40202"},
+        )
+        self.assertAlmostEqual(
+            ZipCentroid.objects.get(zipcode="00601").longitude, -66.749961
+        )
+
+
+class RadiusMathTests(TestCase):
+    def test_haversine_distance(self):
+        # Louisville to Lexington is roughly 70 miles as the crow flies
+        self.assertAlmostEqual(
+            haversine_miles(38.2530, -85.7510, 38.0460, -84.4960), 70, delta=3
+        )
+
+    def test_bounding_box_contains_radius(self):
+        min_lat, max_lat, min_lon, max_lon = bounding_box(38.25, -85.75, 50)
+        self.assertLess(min_lat, 38.25 - 0.7)
+        self.assertGreater(max_lon, -85.75 + 0.9)
+
+    def test_zipcodes_within(self):
+        call_command("load_zip_centroids", stdout=StringIO())
+        within = zipcodes_within("40202", 10)
+        self.assertIn("40202", within)
+        self.assertIn("47130", within)  # Jeffersonville, across the river
+        self.assertNotIn("40507", within)
+        self.assertIsNone(zipcodes_within("00000", 10))
+
+
+class NearFilterTests(TestCase):
+    def setUp(self):
+        call_command("load_zip_centroids", stdout=StringIO())
+        self.client = APIClient()
+        self.louisville = Church.objects.create(
+            name="Louisville Church", zipcode="40202"
+        )
+        self.nashville = Church.objects.create(name="Nashville Church", zipcode="37201")
+        self.user = User.objects.create_user(
+            email="staff@example.org",
+            username="staff@example.org",
+            password="securepassword",
+            name="Church Staff",
+            status="active",
+            church_id=self.louisville,
+        )
+        self.user.groups.add(Group.objects.get_or_create(name="Church User")[0])
+        self.client.force_authenticate(user=self.user)
+
+    def make_job(self, church):
+        return Job.objects.create(
+            church=church,
+            title="Youth Pastor",
+            ministry_type="Youth",
+            employment_type="Full Time",
+            job_description="Description",
+            about_church="About",
+            status="approved",
+        )
+
+    def make_profile(self, zipcode):
+        email = f"candidate{zipcode.strip()}@example.com"
+        user = User.objects.create_user(
+            email=email, username=email, password="x", name="Candidate", status="active"
+        )
+        return Profile.objects.create(user=user, zipcode=zipcode, status="approved")
+
+    def result_ids(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {r["id"] for r in response.data["results"]}
+
+    def test_approved_jobs_near_zip(self):
+        nearby = self.make_job(self.louisville)
+        far = self.make_job(self.nashville)
+        url = "/api/jobs/approved-jobs/"
+        self.assertEqual(self.result_ids(url, near="40207", radius=10), {nearby.id})
+        self.assertEqual(
+            self.result_ids(url, near="40207", radius=200), {nearby.id, far.id}
+        )
+
+    def test_approved_candidates_near_zip_uses_default_radius(self):
+        nearby = self.make_profile("47150")
+        self.make_profile("40502")
+        url = "/api/approved-candidates/"
+        self.assertEqual(self.result_ids(url, near="40202"), {nearby.id})
+
+    def test_zip_plus_four_and_padded_zips_match(self):
+        church = Church.objects.create(name="Highlands Church", zipcode="40204-1234")
+        job = self.make_job(church)
+        profile = self.make_profile(" 40207 ")
+        self.assertEqual(
+            self.result_ids("/api/jobs/approved-jobs/", near="40202", radius=10),
+            {job.id},
+        )
+        self.assertEqual(
+            self.result_ids("/api/approved-candidates/", near="40202", radius=10),
+            {profile.id},
+        )
+
+    def test_unknown_zip_matches_nothing(self):
+        self.make_profile("40202")
+        self.assertEqual(
+            self.result_ids("/api/approved-candidates/", near="00000"), set()
+        )
+
+    def test_negative_radius_is_rejected(self):
+        response = self.client.get(
+            "/api/approved-candidates/", {"near": "40202", "radius": -1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
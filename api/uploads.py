@@ -0,0 +1,225 @@
+"""
+Direct-to-storage uploads for Profile.resume and Profile.profile_image.
+
+1. The client asks for an upload (field, filename, content type, size) and gets a
+   presigned POST (url + form fields) for a fresh key under the field's upload_to
+   prefix, plus a signed upload_token.
+2. The client POSTs the file straight to the url, so the bytes never pass through
+   the app servers.
+3. The client confirms with the upload_token; the object's presence and size are
+   checked with a HEAD-style storage call before the key is attached to the profile.
+
+Tokens are single-use: each records the file the field held when it was issued, and
+is only accepted while the field still holds it. Otherwise a replayed token could
+re-attach a key that a later upload had already queued for deletion.
+
+The presigner comes from the UPLOAD_PRESIGNER setting: S3Presigner in production, and
+LocalPresigner (which posts to LocalUploadAPIView and writes to the default storage)
+for development and tests.
+"""
+
+import os
+import uuid
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from django.utils.text import get_valid_filename
+from .models import FileDeletion, Profile
+
+TOKEN_SALT = "api.uploads.token"
+POLICY_SALT = "api.uploads.local-policy"
+
+# Per field: allowed content types (with their extensions) and size limit in bytes
+UPLOAD_RULES = {
+    "resume": {
+        "content_types": {
+            "application/pdf": {".pdf"},
+            "application/msword": {".doc"},
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document": {
+                ".docx"
+            },
+        },
+        "max_bytes": 10 * 1024 * 1024,
+    },
+    "profile_image": {
+        "content_types": {
+            "image/jpeg": {".jpg", ".jpeg"},
+            "image/png": {".png"},
+            "image/gif": {".gif"},
+            "image/webp": {".webp"},
+        },
+        "max_bytes": 5 * 1024 * 1024,
+    },
+}
+
+
+class UploadError(Exception):
+    pass
+
+
+def field_storage(field):
+    return Profile._meta.get_field(field).storage
+
+
+def new_key(field, filename):
+    upload_to = Profile._meta.get_field(field).upload_to
+    name = get_valid_filename(os.path.basename(filename))[-100:] or "upload"
+    return f"{upload_to}{uuid.uuid4().hex}/{name}"
+
+
+def field_for_key(key):
+    for field in UPLOAD_RULES:
+        if key.startswith(Profile._meta.get_field(field).upload_to):
+            return field
+    raise UploadError("The key is outside the upload prefixes.")
+
+
+def check_file(field, filename, content_type):
+    """Raise UploadError unless the field accepts this file type."""
+    allowed = UPLOAD_RULES[field]["content_types"]
+    if content_type not in allowed:
+        raise UploadError(f"Unsupported content type for {field}: {content_type}.")
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in allowed[content_type]:
+        raise UploadError(f"The file extension does not match {content_type}.")
+
+
+def get_presigner():
+    return import_string(settings.UPLOAD_PRESIGNER)()
+
+
+def create_upload(profile, field, filename, content_type, size):
+    check_file(field, filename, content_type)
+    max_bytes = UPLOAD_RULES[field]["max_bytes"]
+    if size > max_bytes:
+        raise UploadError(f"The file is larger than {max_bytes} bytes.")
+
+    key = new_key(field, filename)
+    expires_in = settings.UPLOAD_URL_EXPIRY_SECONDS
+    presigned = get_presigner().presign(
+        field_storage(field), key, content_type, max_bytes, expires_in
+    )
+    token = signing.dumps(
+        {
+            "user": profile.user_id,
+            "field": field,
+            "key": key,
+            "replaces": getattr(profile, field).name or "",
+        },
+        salt=TOKEN_SALT,
+    )
+    return {
+        "method": "POST",
+        "url": presigned["url"],
+        "fields": presigned["fields"],
+        "key": key,
+        "upload_token": token,
+        "expires_in": expires_in,
+    }
+
+
+def read_upload_token(user, token):
+    """
+    Return (field, key, replaces) for a token issued to `user` that has not expired;
+    `replaces` is the name the field held when the token was issued.
+    """
+    try:
+        # Confirmation may come a little after the upload URL itself expired
+        data = signing.loads(
+            token, salt=TOKEN_SALT, max_age=2 * settings.UPLOAD_URL_EXPIRY_SECONDS
+        )
+    except signing.BadSignature:
+        raise UploadError("Invalid or expired upload token.")
+    if data.get("user") != user.pk or data.get("field") not in UPLOAD_RULES:
+        raise UploadError("Invalid or expired upload token.")
+    return data["field"], data["key"], data.get("replaces", "")
+
+
+def check_uploaded_object(field, key):
+    storage = field_storage(field)
+    if not storage.exists(key):
+        raise UploadError("The file has not been uploaded.")
+    if storage.size(key) > UPLOAD_RULES[field]["max_bytes"]:
+        raise UploadError("The uploaded file is too large.")
+
+
+@transaction.atomic
+def attach_upload(profile, field, key, replaces):
+    """
+    Point the profile's field at an uploaded object, replacing any previous file.
+    The profile row is locked so the token's single use is checked atomically.
+    """
+    old_name = (
+        Profile.objects.select_for_update()
+        .values_list(field, flat=True)
+        .get(pk=profile.pk)
+    )
+    if (old_name or "") != replaces:
+        raise UploadError(
+            "This upload token was already used or superseded; request a new upload."
+        )
+    check_uploaded_object(field, key)
+    setattr(profile, field, key)
+    profile.save(update_fields=[field, "updated_at"])
+    FileDeletion.enqueue(old_name)
+    return profile
+
+
+class S3Presigner:
+    """
+    Presigned POST for the bucket behind S3Boto3Storage. No AWS_LOCATION prefix is
+    configured, so storage names are the bucket keys.
+    """
+
+    def presign(self, storage, key, content_type, max_bytes, expires_in):
+        return storage.bucket.meta.client.generate_presigned_post(
+            Bucket=storage.bucket_name,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+
+class LocalPresigner:
+    """
+    Development and test stand-in for S3Presigner with the same response shape:
+    the form posts to LocalUploadAPIView, which checks the signed policy and writes
+    the file to the field's (local) storage.
+    """
+
+    def presign(self, storage, key, content_type, max_bytes, expires_in):
+        policy = signing.dumps(
+            {"key": key, "content_type": content_type, "max_bytes": max_bytes},
+            salt=POLICY_SALT,
+        )
+        return {
+            "url": reverse("local-upload"),
+            "fields": {"key": key, "Content-Type": content_type, "policy": policy},
+        }
+
+
+def store_local_upload(fields, uploaded_file):
+    """Check a LocalPresigner form post like S3 would, then save the file."""
+    try:
+        policy = signing.loads(
+            fields.get("policy", ""),
+            salt=POLICY_SALT,
+            max_age=settings.UPLOAD_URL_EXPIRY_SECONDS,
+        )
+    except signing.BadSignature:
+        raise UploadError("Invalid or expired upload policy.")
+    key = policy["key"]
+    if fields.get("key") != key or fields.get("Content-Type") != policy["content_type"]:
+        raise UploadError("The form does not match the upload policy.")
+    if uploaded_file is None or not 0 < uploaded_file.size <= policy["max_bytes"]:
+        raise UploadError("The file size is outside the allowed range.")
+    storage = field_storage(field_for_key(key))
+    if storage.exists(key) or storage.save(key, uploaded_file) != key:
+        raise UploadError("The upload key is already taken.")
+    return key
@@ -10,15 +10,21 @@ from .views import (
     ChurchViewSet,
     InviteCodeViewSet,
     JobViewSet,
+    LocalUploadAPIView,
     MutualInterestViewSet,
     ProfileMeUpdateAPIView,
+    ProfileRecommendedJobsAPIView,
     ProfileResetAPIView,
+    ProfileUploadAPIView,
+    ProfileUploadConfirmAPIView,
     ProfileListAPIView,
+    ProfilingReportAPIView,
     ResetPasswordAPIView,
     UpdateProfileStatusView,
     UpdateJobStatusView,
     UserMeAPIView,
     UserViewSet,
+    event_stream,
 )
 
 
@@ -34,11 +40,17 @@ router.register(r"users", UserViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
+    path(
+        "admin/profiling/",
+        ProfilingReportAPIView.as_view(),
+        name="profiling-report",
+    ),
     path(
         "candidates/register/",
         CandidateRegistrationAPIView.as_view(),
         name="candidate-register",
     ),
+    path("events/", event_stream, name="event-stream"),
     path(
         "jobs/<int:pk>/review/",
         UpdateJobStatusView.as_view(),
@@ -51,9 +63,21 @@ urlpatterns = [
         name="update-profile-status",
     ),
     path("profile/me/", ProfileMeUpdateAPIView.as_view(), name="profile-me"),
+    path(
+        "profile/me/recommended-jobs/",
+        ProfileRecommendedJobsAPIView.as_view(),
+        name="profile-recommended-jobs",
+    ),
+    path("profile/me/uploads/", ProfileUploadAPIView.as_view(), name="profile-upload"),
+    path(
+        "profile/me/uploads/confirm/",
+        ProfileUploadConfirmAPIView.as_view(),
+        name="profile-upload-confirm",
+    ),
     path("profile/reset/", ProfileResetAPIView.as_view(), name="profile-reset"),
     path("reset-password/", ResetPasswordAPIView.as_view(), name="reset-password"),
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("uploads/local/", LocalUploadAPIView.as_view(), name="local-upload"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("user/me/", UserMeAPIView.as_view(), name="user-me"),
 ]
@@ -1,5 +1,10 @@
+import json
+import time
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count
+from django.contrib.auth.hashers import check_password
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status, viewsets
@@ -9,9 +14,22 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
-from .models import Church, InviteCode, Job, MutualInterest, Profile
-from .permissions import IsAdmin, IsAdminOrChurch, IsChurchUser
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from . import events, profiling, uploads
+from .cache import api_cache
+from .caching import cached_list_response
+from .filters import ApprovedCandidateFilter, JobFilter
+from .models import Church, InviteCode, Job, MutualInterest, Profile, Recommendation
+from .pagination import (
+    CreatedAtCursorPagination,
+    PageNumberOrCursorPagination,
+    ScoreCursorPagination,
+)
+from .permissions import IsAdmin, IsAdminOrChurch, IsChurchUser, get_group_names
+from .search import search_jobs
 from .serializers import (
     CandidateRegistrationSerializer,
     ChurchSerializer,
@@ -21,7 +39,11 @@ from .serializers import (
     ProfileSerializer,
     ProfileResetSerializer,
     ProfileStatusSerializer,
+    ProfileUploadConfirmSerializer,
+    ProfileUploadSerializer,
     MutualInterestSerializer,
+    RecommendedCandidateSerializer,
+    RecommendedJobSerializer,
     ResetPasswordSerializer,
     UserCreateSerializer,
     UserMeSerializer,
@@ -34,11 +56,28 @@ User = get_user_model()
 
 class ApprovedCandidateViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ProfileSerializer
+    # Read-only: authorize from token claims without loading the User row
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsAuthenticated, IsChurchUser]
+    pagination_class = PageNumberOrCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ApprovedCandidateFilter
 
     def get_queryset(self):
-        return Profile.objects.select_related("user").filter(
-            status="approved", user__is_active=True
+        return (
+            Profile.objects.select_related("user", "invite_code")
+            .filter(status="approved", user__is_active=True)
+            .order_by("-created_at", "-id")
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return cached_list_response(
+            self,
+            request,
+            queryset,
+            tags=["candidates"],
+            related=["user", "invite_code"],
         )
 
 
@@ -70,11 +109,72 @@ class ChurchViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"])
     def users(self, request, pk=None):
         church = self.get_object()
-        users = church.user_set.all()
+        users = church.users.prefetch_related("groups").order_by("id")
+        page = self.paginate_queryset(users)
+        if page is not None:
+            serializer = UserSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = UserSerializer(users, many=True)
         return Response(serializer.data)
 
 
+async def event_stream(request):
+    """
+    Server-sent events for new interests and matches (see api/events.py): the
+    user's own channel, plus their church's for church users. EventSource cannot
+    send headers, so the access token may also be passed as ?token=. The stream
+    ends when the token expires; clients reconnect with a fresh one and refetch.
+    Needs an ASGI server: WSGI would buffer the endless response.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event streams are only served over ASGI."}, status=501
+        )
+    header = request.headers.get("Authorization", "")
+    raw_token = header[7:] if header.startswith("Bearer ") else None
+    raw_token = raw_token or request.GET.get("token")
+    authentication = JWTStatelessUserAuthentication()
+    try:
+        token = authentication.get_validated_token(raw_token or "")
+        user = authentication.get_user(token)
+    except InvalidToken:
+        return JsonResponse({"detail": "A valid access token is required."}, status=401)
+
+    channels = [f"user:{user.id}"]
+    if user.church_id:
+        channels.append(f"church:{user.church_id}")
+    expires_at = token.payload.get("exp")
+    heartbeat = settings.EVENTS_HEARTBEAT_SECONDS
+    broker = events.get_broker()
+
+    async def stream():
+        subscription = broker.subscribe(channels)
+        try:
+            yield "retry: 5000\n\n"
+            while expires_at is None or time.time() < expires_at:
+                timeout = heartbeat
+                if expires_at is not None:
+                    timeout = max(0.0, min(timeout, expires_at - time.time()))
+                event = await subscription.get(timeout)
+                if subscription.overflowed:
+                    # Events were dropped: the client should refetch everything
+                    subscription.overflowed = False
+                    yield "event: resync\ndata: {}\n\n"
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 class InviteCodeViewSet(viewsets.ModelViewSet):
     queryset = InviteCode.objects.select_related("created_by").all()
     serializer_class = InviteCodeSerializer
@@ -96,8 +196,9 @@ class JobViewSet(viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated, IsAdminOrChurch]
+    pagination_class = PageNumberOrCursorPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["status", "church", "ministry_type", "employment_type"]
+    filterset_class = JobFilter
 
     def perform_create(self, serializer):
         church = self.request.user.church_id
@@ -114,19 +215,53 @@ class JobViewSet(viewsets.ModelViewSet):
         detail=False,
         methods=["get"],
         url_path="approved-jobs",
+        authentication_classes=[JWTStatelessUserAuthentication],
         permission_classes=[IsAuthenticated],
     )
     def approved_jobs(self, request):
-        queryset = Job.objects.filter(status="approved").order_by("-created_at")
-        # Use the built-in paginator
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        queryset = self.filter_queryset(
+            Job.objects.filter(status="approved")
+            .select_related("church")
+            .order_by("-created_at", "-id")
+        )
+        return cached_list_response(
+            self, request, queryset, tags=["jobs"], related=["church"]
+        )
 
-        # Fallback if pagination fails
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="search",
+        authentication_classes=[JWTStatelessUserAuthentication],
+        permission_classes=[IsAuthenticated],
+        # Results are ordered by relevance, which cursor pagination cannot key on
+        pagination_class=PageNumberPagination,
+    )
+    def search(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"q": "This query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = search_jobs(
+            Job.objects.filter(status="approved").select_related("church"), text
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="recommended-candidates")
+    def recommended_candidates(self, request, pk=None):
+        job = self.get_object()
+        # Rows for a profile that has since left "approved" wait for the queued refresh
+        queryset = Recommendation.objects.filter(
+            job=job, profile__status="approved", profile__user__is_active=True
+        ).select_related("profile__user", "profile__invite_code")
+        paginator = ScoreCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = RecommendedCandidateSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(
         detail=False,
@@ -140,27 +275,48 @@ class JobViewSet(viewsets.ModelViewSet):
             return Response(
                 {"detail": "You are not associated with a church."}, status=403
             )
-        queryset = Job.objects.filter(church_id=church_id).order_by("-created_at")
-        # Use the built-in paginator
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        queryset = (
+            Job.objects.filter(church_id=church_id)
+            .select_related("church")
+            .order_by("-created_at", "-id")
+        )
+        return cached_list_response(
+            self, request, queryset, tags=[f"church:{church_id}"], related=["church"]
+        )
 
-        # Fallback if pagination fails
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+
+class LocalUploadAPIView(APIView):
+    """
+    Receives LocalPresigner form posts (development and tests only), standing in
+    for the S3 bucket; the signed policy field authorizes the request.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    parser_classes = (MultiPartParser,)
+
+    def post(self, request):
+        if settings.UPLOAD_PRESIGNER != "api.uploads.LocalPresigner":
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        try:
+            uploads.store_local_upload(request.data, request.FILES.get("file"))
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class MutualInterestViewSet(viewsets.ModelViewSet):
     queryset = MutualInterest.objects.all()
     serializer_class = MutualInterestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PageNumberOrCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["job_listing", "profile", "expressed_by"]
 
     def get_queryset(self):
-        return MutualInterest.objects.filter(expressed_by_user=self.request.user)
+        return MutualInterest.objects.filter(
+            expressed_by_user=self.request.user
+        ).for_serializer()
 
     @action(
         detail=False,
@@ -175,15 +331,13 @@ class MutualInterestViewSet(viewsets.ModelViewSet):
                 {"detail": "You are not associated with a church."}, status=403
             )
 
-        job_ids = Job.objects.filter(church_id=church_id).values_list("id", flat=True)
-        interests = MutualInterest.objects.filter(job_listing_id__in=job_ids)
+        interests = MutualInterest.objects.filter(
+            job_listing__church_id=church_id
+        ).for_serializer()
 
-        # Paginate
-        paginator = PageNumberPagination()
-        paginated = paginator.paginate_queryset(interests, request)
-
-        serializer = self.get_serializer(paginated, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        page = self.paginate_queryset(interests)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(
         detail=False,
@@ -198,10 +352,13 @@ class MutualInterestViewSet(viewsets.ModelViewSet):
         if not user.church_id:
             return Response([], status=status.HTTP_403_FORBIDDEN)
 
-        # Get all job IDs belonging to the user's church
-        job_ids = list(
-            Job.objects.filter(church=user.church_id).values_list("id", flat=True)
-        )
+        # Return only the 'church' side of each match (to avoid duplicate records)
+        mutual_qs = MutualInterest.objects.filter(
+            expressed_by="church",
+            expressed_by_user=user,
+            job_listing__church=user.church_id,
+            church_match__isnull=False,
+        ).for_serializer()
 
         # Optional filter: restrict to a specific job_listing
         job_filter = request.query_params.get("job_listing")
@@ -214,32 +371,12 @@ class MutualInterestViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            if job_filter not in job_ids:
+            if not Job.objects.filter(pk=job_filter, church=user.church_id).exists():
                 return Response(
                     {"detail": "Job not found or not associated with your church."},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            job_ids = [job_filter]
-
-        # Identify mutual pairs: candidate + church both expressed interest
-        mutual_pairs = (
-            MutualInterest.objects.filter(job_listing_id__in=job_ids)
-            .values("job_listing_id", "profile_id")
-            .annotate(match_count=Count("id"))
-            .filter(match_count=2)
-        )
-
-        matches = [
-            (pair["job_listing_id"], pair["profile_id"]) for pair in mutual_pairs
-        ]
-
-        # Return only the 'church' side of the mutual interest (to avoid duplicate records)
-        mutual_qs = MutualInterest.objects.filter(
-            expressed_by="church",
-            expressed_by_user=user,
-            job_listing_id__in=[j for j, _ in matches],
-            profile_id__in=[p for _, p in matches],
-        ).select_related("job_listing", "profile")
+            mutual_qs = mutual_qs.filter(job_listing_id=job_filter)
 
         # Apply pagination if enabled
         page = self.paginate_queryset(mutual_qs)
@@ -258,44 +395,46 @@ class MutualInterestViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated, IsAdmin],
     )
     def admin_matches(self, request):
-        # Find all (job, profile) pairs that have both candidate + church expressions
-        mutual_pairs = (
-            MutualInterest.objects.values("job_listing_id", "profile_id")
-            .annotate(match_count=Count("id"))
-            .filter(match_count=2)
-        )
-
-        matches = [
-            (pair["job_listing_id"], pair["profile_id"]) for pair in mutual_pairs
-        ]
-
         # Return the church-side expression for each match
         mutual_qs = MutualInterest.objects.filter(
-            expressed_by="church",
-            job_listing_id__in=[j for j, _ in matches],
-            profile_id__in=[p for _, p in matches],
-        ).select_related("job_listing", "profile", "expressed_by_user")
+            church_match__isnull=False
+        ).for_serializer()
+
+        # Opt-in full export: one JSON object per line, read from the DB in chunks
+        if request.query_params.get("stream", "").lower() in ("1", "true"):
+            return StreamingHttpResponse(
+                self._stream_ndjson(mutual_qs.order_by("-created_at", "-id")),
+                content_type="application/x-ndjson",
+            )
 
-        serializer = self.get_serializer(mutual_qs, many=True)
-        return Response(serializer.data)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(mutual_qs, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def _stream_ndjson(self, queryset, chunk_size=500):
+        context = self.get_serializer_context()
+        for interest in queryset.iterator(chunk_size=chunk_size):
+            data = self.get_serializer_class()(interest, context=context).data
+            yield json.dumps(data, cls=JSONEncoder) + "\n"
 
 
 class ProfileListAPIView(GenericAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated, IsAdminOrChurch]
+    pagination_class = PageNumberOrCursorPagination
 
     def get(self, request):
         status_param = request.query_params.get("status")
 
-        profiles = Profile.objects.select_related("user").all()
+        profiles = Profile.objects.select_related("user").order_by("-created_at", "-id")
 
         if status_param:
             profiles = profiles.filter(status=status_param)
 
-        paginator = PageNumberPagination()
-        page = paginator.paginate_queryset(profiles, request)
+        page = self.paginate_queryset(profiles)
         serializer = ProfileSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        return self.get_paginated_response(serializer.data)
 
 
 class ProfileMeAPIView(APIView):
@@ -327,6 +466,22 @@ class ProfileMeUpdateAPIView(RetrieveUpdateAPIView):
         return super().update(request, *args, **kwargs)
 
 
+class ProfileRecommendedJobsAPIView(GenericAPIView):
+    serializer_class = RecommendedJobSerializer
+    # Read-only: the profile is reached through the token's user id
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [IsAuthenticated]
+    pagination_class = ScoreCursorPagination
+
+    def get(self, request):
+        queryset = Recommendation.objects.filter(
+            profile__user_id=request.user.pk, job__status="approved"
+        ).select_related("job__church")
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
 class ProfileResetAPIView(generics.CreateAPIView):
     serializer_class = ProfileResetSerializer
     permission_classes = [IsAuthenticated]
@@ -348,6 +503,44 @@ class ProfileResetAPIView(generics.CreateAPIView):
         return self.create(request, *args, **kwargs)
 
 
+class ProfileUploadAPIView(GenericAPIView):
+    """
+    Issue a presigned POST so a resume or profile image goes straight to storage
+    instead of through this server (see api/uploads.py).
+    """
+
+    serializer_class = ProfileUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        profile = get_object_or_404(Profile, user=request.user)
+        try:
+            upload = uploads.create_upload(profile, **serializer.validated_data)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+
+class ProfileUploadConfirmAPIView(GenericAPIView):
+    serializer_class = ProfileUploadConfirmSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        profile = get_object_or_404(Profile, user=request.user)
+        try:
+            field, key, replaces = uploads.read_upload_token(
+                request.user, serializer.validated_data["upload_token"]
+            )
+            uploads.attach_upload(profile, field, key, replaces)
+        except uploads.UploadError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ProfileSerializer(profile, context={"request": request}).data)
+
+
 class UpdateJobStatusView(GenericAPIView):
     serializer_class = JobStatusSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
@@ -373,6 +566,21 @@ class UpdateProfileStatusView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class ProfilingReportAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        report = profiling.store.report()
+        report["enabled"] = settings.API_PROFILING
+        report["cache"] = api_cache.stats()
+        return Response(report)
+
+    def delete(self, request):
+        profiling.store.clear()
+        api_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class ResetPasswordAPIView(GenericAPIView):
     serializer_class = ResetPasswordSerializer
     permission_classes = [IsAuthenticated]
@@ -382,7 +590,10 @@ class ResetPasswordAPIView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = request.user
 
-        if not user.check_password(serializer.validated_data["temporary_password"]):
+        # Verified without the upgrade-on-login re-hash: it is replaced just below
+        if not check_password(
+            serializer.validated_data["temporary_password"], user.password
+        ):
             return Response(
                 {"detail": "Temporary password is incorrect."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -407,7 +618,7 @@ class UserMeAPIView(GenericAPIView):
 
 
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.prefetch_related("groups").order_by("id")
     serializer_class = UserCreateSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -416,7 +627,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
 
-        if self.request.user.groups.filter(name="Church User").exists():
+        if "Church User" in get_group_names(self.request):
             queryset = queryset.filter(church_id=self.request.user.church_id)
 
         return queryset
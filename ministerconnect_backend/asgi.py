@@ -3,6 +3,13 @@ ASGI config for ministerconnect_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The /api/events/ server-sent events stream needs this entry point; under WSGI it
+answers 501. With the default in-process events broker, serve the whole app (not
+only the stream) from a single ASGI process so that writes and streams share it,
+e.g. `uvicorn ministerconnect_backend.asgi:application` or
+`gunicorn -k uvicorn.workers.UvicornWorker -w 1 ministerconnect_backend.asgi:application`.
+More processes need a shared EVENTS_BROKER (see api/events.py).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -1,5 +1,7 @@
 import os
 import environ
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 
 # Build paths inside the project
@@ -33,6 +35,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so its timings cover the whole stack; inert unless API_PROFILING is set
+    "api.middleware.QueryProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -44,6 +48,39 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per-endpoint query/latency profiling (Server-Timing headers + admin report)
+API_PROFILING = env.bool("API_PROFILING", default=False)
+API_PROFILING_WINDOW = env.int("API_PROFILING_WINDOW", default=500)
+
+# Cache backend (see api/cache.py). The local-memory default is per process; with
+# several gunicorn workers set CACHE_URL to a shared backend, e.g.
+# dbcache://api_cache (after `python manage.py createcachetable`),
+# filecache:///var/tmp/ministerconnect_cache, or redis://host:6379/0 (needs the
+# redis package)
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Cache serialized list pages (see api/caching.py). Tag invalidations only reach
+# workers sharing the cache backend, so this defaults to on only when CACHE_URL
+# selects a shared one; forcing it on with a per-process backend serves stale pages
+PER_PROCESS_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+API_PAGE_CACHE = env.bool(
+    "API_PAGE_CACHE",
+    default=CACHES["default"]["BACKEND"] not in PER_PROCESS_CACHE_BACKENDS,
+)
+# Seconds a serialized list page stays cached; saves invalidate earlier through
+# cache tags
+API_RESPONSE_CACHE_TIMEOUT = env.int("API_RESPONSE_CACHE_TIMEOUT", default=300)
+
+# Server-sent events at /api/events/ (see api/events.py). The in-process broker only
+# reaches streams served by the publishing process: serve the app from one ASGI
+# process (see asgi.py) or plug in a shared broker.
+EVENTS_BROKER = env("EVENTS_BROKER", default="api.events.InProcessBroker")
+# Seconds between keep-alive comments, so proxies do not close idle streams
+EVENTS_HEARTBEAT_SECONDS = env.int("EVENTS_HEARTBEAT_SECONDS", default=15)
+
 # Allow requests from your frontend
 CORS_ALLOWED_ORIGINS = [
     # Deployed frontend
@@ -54,6 +91,10 @@ CORS_ALLOWED_ORIGINS = [
     "https://ministerconnect.vercel.app",
 ]
 
+# Let the frontend send and read the validators of cached list endpoints
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match", "if-modified-since")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
+
 CSRF_TRUSTED_ORIGINS = [
     "https://ministerconnect.org",
     "https://www.ministerconnect.org",
@@ -73,6 +114,13 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+SIMPLE_JWT = {
+    # Embed group and church claims in tokens (see api.authentication.ClaimsTokenUser)
+    "TOKEN_OBTAIN_SERIALIZER": "api.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.serializers.ClaimsTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "api.authentication.ClaimsTokenUser",
+}
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -115,6 +163,40 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (see api/hashers.py). The profile's hasher hashes new passwords;
+# hashes from the others still verify and are re-hashed with the profile's hasher
+# and parameters on the next login. Measure candidates with
+# `python manage.py benchmark_hashers` before changing them. "argon2" needs the
+# argon2-cffi package.
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "api.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "api.hashers.TunedScryptPasswordHasher",
+    "argon2": "api.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHER_PROFILE = env("PASSWORD_HASHER_PROFILE", default="pbkdf2")
+if PASSWORD_HASHER_PROFILE not in PASSWORD_HASHER_PROFILES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER_PROFILE must be one of {', '.join(PASSWORD_HASHER_PROFILES)}"
+    )
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE],
+    *(
+        hasher
+        for name, hasher in PASSWORD_HASHER_PROFILES.items()
+        if name != PASSWORD_HASHER_PROFILE
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+# Cost parameters; unset means Django's default for that hasher
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=None)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int("PASSWORD_SCRYPT_WORK_FACTOR", default=None)
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int("PASSWORD_SCRYPT_BLOCK_SIZE", default=None)
+PASSWORD_SCRYPT_PARALLELISM = env.int("PASSWORD_SCRYPT_PARALLELISM", default=None)
+PASSWORD_ARGON2_TIME_COST = env.int("PASSWORD_ARGON2_TIME_COST", default=None)
+PASSWORD_ARGON2_MEMORY_COST = env.int("PASSWORD_ARGON2_MEMORY_COST", default=None)
+PASSWORD_ARGON2_PARALLELISM = env.int("PASSWORD_ARGON2_PARALLELISM", default=None)
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -152,6 +234,14 @@ else:
     MEDIA_URL = "/media/"
     MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Direct-to-storage uploads (see api/uploads.py): presigned S3 POSTs in production,
+# a local stand-in that saves to MEDIA_ROOT when DEBUG is on
+UPLOAD_PRESIGNER = env(
+    "UPLOAD_PRESIGNER",
+    default="api.uploads.LocalPresigner" if DEBUG else "api.uploads.S3Presigner",
+)
+UPLOAD_URL_EXPIRY_SECONDS = env.int("UPLOAD_URL_EXPIRY_SECONDS", default=900)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,